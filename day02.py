@@ -1,36 +1,25 @@
 """AdventOfCode2019 - Day 2"""
-import intcode
+import intcode_cache
+from intcode import parse
 
 
-def parse(puzzle_input):
-    """Parse the input into a list of opcodes."""
-    return [int(number) for number in puzzle_input.split(",")]
-
-
-def run_prog(interpretor, program, noun, verb):
+def run_prog(program, noun, verb):
     """Run the program with a noun and verb and return the value at position 0."""
-    edited = program.copy()
-    edited[1] = noun
-    edited[2] = verb
-    interpretor.reset()
-    for _ in interpretor.run(edited):
-        pass
-    return interpretor.memory[0]
+    return program.run(patch={1: noun, 2: verb}, peek=[0]).peeked[0]
 
 
 def part1(opcodes):
     """Solve for the answer to part 1."""
-    return run_prog(intcode.Interpretor(), opcodes, 12, 2)
+    return run_prog(intcode_cache.PureProgram(opcodes), 12, 2)
 
 
 def part2(opcodes):
     """Solve for the answer to part 2."""
-    interpretor = intcode.Interpretor()
-
+    program = intcode_cache.PureProgram(opcodes)
     # assume the program is linear
-    constant_term = run_prog(interpretor, opcodes, 0, 0)
-    noun_term = run_prog(interpretor, opcodes, 1, 0) - constant_term
-    verb_term = run_prog(interpretor, opcodes, 0, 1) - constant_term
+    constant_term = run_prog(program, 0, 0)
+    noun_term = run_prog(program, 1, 0) - constant_term
+    verb_term = run_prog(program, 0, 1) - constant_term
 
     desired_output = 19690720
     verbs = [
@@ -39,6 +28,6 @@ def part2(opcodes):
     ]
     verbs = [verb for verb in verbs if verb >= 0 and verb == int(verb)]
     noun, verb = len(verbs) - 1, int(verbs[-1])
-    assert run_prog(interpretor, opcodes, noun, verb) == desired_output
+    assert run_prog(program, noun, verb) == desired_output
 
     return 100 * noun + verb
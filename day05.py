@@ -1,6 +1,6 @@
 """AdventOfCode2019 - Day 5"""
 import intcode
-from day02 import parse
+from intcode import parse
 
 
 def run_tests(program, input_constant):
@@ -1,32 +1,33 @@
 """AdventOfCode2019 - Day 7"""
-import collections
 import itertools
 import intcode
-from day02 import parse
+from intcode import parse
 
-Amplifier = collections.namedtuple("Amplifier", "interpretor output")
 
+def load_amplifier(program):
+    """Create an interpretor with the amplifier program loaded, to fork amplifiers from."""
+    template = intcode.Interpretor()
+    template.reset(intcode.ProgramTemplate(program))
+    return template
 
-def pipeline(program, amplifier_count, phase_settings, loop=False):
+
+def pipeline(template, amplifier_count, phase_settings, loop=False):
     """Run a signal that starts at 0 through a pipeline of amplifiers."""
     # Create the amplifiers
-    amplifiers = [
-        Amplifier(interpretor, output=interpretor.run(program))
-        for _ in range(amplifier_count)
-        for interpretor in [intcode.Interpretor()]
-    ]
+    amplifiers = [template.fork() for _ in range(amplifier_count)]
     # Setup phase settings
     for amplifier, phase_setting in zip(amplifiers, phase_settings):
-        amplifier.interpretor.queue_input(phase_setting)
+        amplifier.queue_input(phase_setting)
     # Run the signal through
     signal = 0
     curr = 0
     while curr < len(amplifiers):
-        amplifiers[curr].interpretor.queue_input(signal)
-        try:
-            signal = next(amplifiers[curr].output)
-        except StopIteration:
+        amplifiers[curr].queue_input(signal)
+        status, output = amplifiers[curr].resume()
+        if status == intcode.HALTED:
             break
+        assert status == intcode.PRODUCED_OUTPUT, "amplifier needed more input"
+        signal = output
         curr += 1
         if loop:
             curr = curr % len(amplifiers)
@@ -35,15 +36,17 @@ def pipeline(program, amplifier_count, phase_settings, loop=False):
 
 def part1(opcodes):
     """Solve for the answer to part 1."""
+    template = load_amplifier(opcodes)
     return max(
-        pipeline(opcodes, 5, phase_settings)
+        pipeline(template, 5, phase_settings)
         for phase_settings in itertools.permutations(range(5))
     )
 
 
 def part2(opcodes):
     """Solve for the answer to part 2."""
+    template = load_amplifier(opcodes)
     return max(
-        pipeline(opcodes, 5, phase_settings, loop=True)
+        pipeline(template, 5, phase_settings, loop=True)
         for phase_settings in itertools.permutations(range(5, 10))
     )
@@ -1,6 +1,6 @@
 """AdventOfCode2019 - Day 9"""
 from day05 import run_tests
-from day02 import parse
+from intcode import parse
 
 
 def part1(boost_program):
@@ -1,6 +1,6 @@
 """AdventOfCode2019 - Day 11"""
 import intcode
-from day02 import parse
+from intcode import parse
 
 WHITE, BLACK = RIGHT, LEFT = 1, 0
 
@@ -3,7 +3,6 @@ import collections
 import copy
 import itertools
 import re
-import multiprocessing
 import functools
 from util import sign, lcm_all
 
@@ -73,6 +72,8 @@ def find_period(moons, initial_states, axis):
 
 def part2(moons):
     """Solve for the answer to part 2."""
+    import multiprocessing  # pylint: disable=import-outside-toplevel
+
     initial_states = [state_tuple(moons, axis) for axis in range(3)]
     period_finder = functools.partial(find_period, moons, initial_states)
     with multiprocessing.Pool(3) as pool:
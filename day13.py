@@ -1,7 +1,7 @@
 """AdventOfCode2019 - Day 13"""
 import collections
 import intcode
-from day02 import parse
+from intcode import parse
 
 BLOCK_TILE, PLAYER_TILE, BALL_TILE = 1, 3, 4
 LEFT, NEUTRAL, RIGHT = -1, 0, 1
@@ -1,7 +1,7 @@
 """AdventOfCode2019 - Day 15"""
 import intcode
 from util import bfs, tuple_add
-from day02 import parse
+from intcode import parse
 
 NORTH, EAST, SOUTH, WEST = tuple(range(4))
 HIT_WALL, MOVED, FOUND_STATION = 0, 1, 2
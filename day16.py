@@ -1,6 +1,5 @@
 """AdventOfCode2019 - Day 16"""
 import itertools
-import multiprocessing
 import functools
 from util import repeat_each
 
@@ -35,6 +34,8 @@ def parse(puzzle_input):
 
 def part1(signal):
     """Solve for the answer to part 1."""
+    import multiprocessing  # pylint: disable=import-outside-toplevel
+
     with multiprocessing.Pool() as pool:
         for _ in range(100):
             signal = apply_fft(signal, pool)
@@ -1,8 +1,8 @@
 """AdventOfCode2019 - Day 17"""
 import collections
 import intcode
-from util import count_occurences, replace_occurences, ilast, tuple_add
-from day02 import parse
+from util import count_occurences, replace_occurences, tuple_add
+from intcode import parse
 
 DIRECTIONS = {"<": (-1, 0), ">": (1, 0), "^": (0, -1), "v": (0, 1)}
 TURNS = {
@@ -84,17 +84,17 @@ def find_path(scaffolds, robot):
     return path
 
 
-def queue_programs(interpretor, programs):
+def queue_programs(channel, programs):
     """Queue input to submit a sequence of programs to the robot.
-    :param interpretor: the intcode interpretor to queue as input for.
+    :param channel: the ascii channel of the intcode interpretor to queue as input for.
     :param programs: expected as a sequence of programs, where each program is a list of string
-    instructions. The instructions are comma delimited and newline terminated by this function,
+    instructions. The instructions are comma delimited and newline terminated by the channel,
     then converted to ascii and queued as input to the program.
     """
     for program in programs:
-        assembled = bytes(",".join(program) + "\n", "ascii")
-        assert len(assembled) <= 20, "Program was too long"
-        interpretor.queue_inputs(assembled)
+        assembled = ",".join(program)
+        assert len(assembled) < 20, "Program was too long"
+        channel.send(assembled)
 
 
 def interpret_image(image_string):
@@ -130,8 +130,7 @@ def calibrate(scaffolds):
 def part1(program, state):
     """Solve for the answer to part 1."""
     # Run the program to collect all the output
-    interpretor = intcode.Interpretor()
-    image_string = "".join(chr(code) for code in interpretor.run(program))
+    image_string = intcode.AsciiChannel(intcode.Interpretor(), program).read()
     state["robot"], state["scaffolds"] = interpret_image(image_string)
     return calibrate(state["scaffolds"])
 
@@ -140,7 +139,8 @@ def part2(program, state):
     """Solve for the answer to part 2."""
     path = find_path(state["scaffolds"], state["robot"])
     programs = find_programs(path)
-    interpretor = intcode.Interpretor()
-    queue_programs(interpretor, [*programs, "n"])
     program[0] = 2
-    return ilast(interpretor.run(program))
+    channel = intcode.AsciiChannel(intcode.Interpretor(), program)
+    queue_programs(channel, [*programs, "n"])
+    channel.read()
+    return channel.values[-1]
@@ -1,15 +1,15 @@
 """AdventOfCode2019 - Day 19"""
 import itertools
-import intcode
-from day02 import parse
+import intcode_cache
+from intcode import parse
 
 
 class Drone:
     """Class handling the drone state / output."""
 
     def __init__(self, program):
-        self.program = program
-        self.interpretor = intcode.Interpretor()
+        # Probes are memoized since the same positions get checked again
+        self.program = intcode_cache.PureProgram(program)
         self.rows = {0: (0, 1)}  # self.rows[y] = (start, end) of beam for row y
         self.find_start()
 
@@ -54,9 +54,7 @@ class Drone:
     def force_check(self, pos_x, pos_y):
         """Run the program to check a given position for the tractor beam."""
         assert pos_x >= 0 and pos_y >= 0, f"{pos_x},{pos_y} is an invalid position"
-        self.interpretor.reset()
-        self.interpretor.queue_inputs((pos_x, pos_y))
-        return next(self.interpretor.run(self.program))
+        return self.program.run((pos_x, pos_y)).outputs[0]
 
 
 def part1(program, state):
@@ -1,18 +1,17 @@
 """AdventOfCode2019 - Day 21"""
 import intcode
-from util import ilast
-from day02 import parse
+from intcode import parse
 
 
 def run_droid(program, script, debug=False):
     """Execute a springdroid script, expected as a sequence of instruction strings."""
-    interpretor = intcode.Interpretor()
-    for instr in script:
-        interpretor.queue_inputs(bytes(instr + "\n", "ascii"))
+    channel = intcode.AsciiChannel(intcode.Interpretor(), program)
+    channel.send(*script)
+    text = channel.read()
     if debug:
-        print(bytes(interpretor.run(program)).decode("ascii"))
-        return None
-    return ilast(interpretor.run(program))
+        print(text)
+    assert channel.values, f"The droid didn't make it across:\n{text}"
+    return channel.values[-1]
 
 
 def part1(program):
@@ -1,96 +1,91 @@
 """AdventOfCode2019 - Day 23"""
-from multiprocessing import Queue, Process, Event
-import queue
-import time
 import intcode
-from day02 import parse
+import intcode_specialize
+from intcode import parse
+
+NAT_ADDRESS = 255
+QUANTUM = 2000  # instructions each controller runs per turn
+IDLE_POLLS = 3  # polls for input without receiving anything before a NIC counts as idle
 
 
 class NATDevice:
     """Class for a NAT device. Receives packets."""
 
-    def __init__(self, nics, idle_flags):
-        self.received = Queue()
+    def __init__(self, nics):
+        self.received = []
         self.nics = nics
-        self.idle_flags = idle_flags
+
+    def idle(self):
+        """Check whether the network is idle."""
+        return all(nic.idle_polls >= IDLE_POLLS for nic in self.nics)
+
+    def step(self):
+        """Give every controller a turn."""
+        for nic in self.nics:
+            nic.take_turn(self, self.nics)
 
     def first_received(self):
         """Return the first received packet."""
-        return self.received.get()
+        while not self.received:
+            self.step()
+        return self.received[0]
 
     def first_repeated(self):
         """Run the network until the NAT repeats itself, returning the repeated value."""
         seen = set()
-        prev = None
         while True:
-            # Get packets
-            while True:
-                try:
-                    prev = self.received.get_nowait()
-                except queue.Empty:
-                    break
-            # Check if the network is idle
-            if all(flag.is_set() for flag in self.idle_flags):
-                if prev in seen:
-                    return prev
-                seen.add(prev)
-                for flag in self.idle_flags:
-                    flag.clear()
-                self.nics[0].received.put(prev)
+            self.step()
+            if self.received and self.idle():
+                packet = self.received[-1]
+                if packet in seen:
+                    return packet
+                seen.add(packet)
+                self.nics[0].receive(packet)
 
 
 class NIController:
     """Class for a Network Interface Controller. Sends and receives packets."""
 
-    def __init__(self, program, address, idle_flag):
-        self.program = program
-        self.address = address
-        self.received = Queue()
-        self.next_input = None
-        self.idle_flag = idle_flag
-        self.input_cum = 0
-
-    def _get_input(self):
-        if self.next_input is not None:
-            result, self.next_input = self.next_input, None
-            return result
-        try:
-            result, self.next_input = self.received.get_nowait()
-            return result
-        except queue.Empty:
-            self.input_cum += 1
-            if self.input_cum > 2:
-                self.idle_flag.set()
-                self.input_cum = 0
-            time.sleep(0.005)
-            return -1
-
-    def run(self, nat, nics):
-        """Run the controller in an infinite loop."""
-        machine = intcode.Interpretor(input_from=self._get_input)
-        machine.queue_input(self.address)
-        for dest, packet_x, packet_y in machine.run(self.program, group=3):
-            self.input_cum = 0
-            self.idle_flag.clear()
+    def __init__(self, program, address):
+        # Boot from the state after reading the address, which is cached between networks
+        boot = intcode_specialize.specialize(program, [address])
+        self.machine = boot.interpretor()
+        # Packets sent while booting go out one per turn before the machine runs again
+        complete = len(boot.outputs) // 3 * 3
+        self.outbox = [boot.outputs[idx : idx + 3] for idx in range(0, complete, 3)]
+        self.machine.output_group.extend(boot.outputs[complete:])
+        self.idle_polls = 0
+
+    def receive(self, packet):
+        """Queue a packet to be read by the controller."""
+        self.machine.queue_inputs(packet)
+        self.idle_polls = 0
+
+    def take_turn(self, nat, nics):
+        """Run the controller until it sends a packet, polls for input without having any,
+        or uses up its quantum.
+        """
+        if self.outbox:
+            status, output = intcode.PRODUCED_OUTPUT, self.outbox.pop(0)
+        else:
+            status, output = self.machine.resume(max_steps=QUANTUM, group=3)
+        if status == intcode.NEEDS_INPUT:
+            self.idle_polls += 1
+            self.machine.queue_input(-1)
+        elif status == intcode.PRODUCED_OUTPUT:
+            self.idle_polls = 0
+            dest, packet_x, packet_y = output
             packet = packet_x, packet_y
-            if dest == 255:
-                nat.received.put(packet)
+            if dest == NAT_ADDRESS:
+                nat.received.append(packet)
             else:
-                nics[dest].received.put(packet)
+                nics[dest].receive(packet)
 
 
 def run_network(program, nat_user):
     """Run a network, calling nat_user on the NAT once the network is set up."""
-    idle_flags = [Event() for _ in range(50)]
-    nics = [NIController(program, addr, idle_flags[addr]) for addr in range(50)]
-    nat = NATDevice(nics, idle_flags)
-    processes = [Process(target=nic.run, args=(nat, nics)) for nic in nics]
-    for process in processes:
-        process.start()
-    result = nat_user(nat)
-    for process in processes:
-        process.terminate()
-    return result
+    nics = [NIController(program, addr) for addr in range(50)]
+    return nat_user(NATDevice(nics))
 
 
 def part1(program):
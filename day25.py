@@ -4,10 +4,13 @@ Some pretty ugly / complex code to do BFS and item combination testing.
 As far as I know this should work for any person's input.
 """
 import collections
+import os
 import re
 import intcode
+import intcode_cache
+import intcode_checkpoint
 from util import combinations
-from day02 import parse
+from intcode import parse
 
 # Assuming the dangerous items are the same for everyone
 DEATH_ITEMS = {
@@ -18,6 +21,10 @@ DEATH_ITEMS = {
     "photons",
 }
 
+# Set DAY25_CHECKPOINT to a file path to save the game at the security checkpoint once
+# and start later runs from there
+CHECKPOINT = os.environ.get("DAY25_CHECKPOINT")
+
 BACKTRACK = {
     "north": "south",
     "south": "north",
@@ -102,6 +109,10 @@ class Solver:
         for command in commands:
             self.queue_command(command)
 
+    def at_checkpoint(self):
+        """Check whether the droid has just reached the room before the exit."""
+        return self.at_end and not self.command_queue and not self.light_items
+
     def get_command(self, description):
         """Return a command to execute given the current description."""
         # Return any queued commands
@@ -151,25 +162,53 @@ class Solver:
         return self.get_command(description)
 
 
+def load_checkpoint(channel, solver, digest):
+    """Resume the game from the saved checkpoint if there is a usable one for this
+    program. Returns the description of the current room, or None.
+    """
+    if CHECKPOINT is None or not os.path.exists(CHECKPOINT):
+        return None
+    try:
+        checkpoint = intcode_checkpoint.load(CHECKPOINT)
+    except ValueError:
+        return None
+    if checkpoint.metadata["digest"] != digest:
+        return None
+    channel.interpretor.restore(checkpoint.snapshot)
+    solver.inv.update(checkpoint.metadata["inventory"])
+    solver.explorer.exit = checkpoint.metadata["exit"]
+    solver.at_end = True
+    return checkpoint.metadata["description"]
+
+
+def save_checkpoint(channel, solver, digest, description):
+    """Save the game, which should be at the room before the exit."""
+    metadata = {
+        "digest": digest,
+        "inventory": sorted(solver.inv),
+        "exit": solver.explorer.exit,
+        "description": description,
+    }
+    intcode_checkpoint.save(channel.interpretor, CHECKPOINT, metadata)
+
+
 def part1(program):
     """Solve for the answer to part 1."""
-    output_queue = []
     solver = Solver()
-    interpretor = intcode.Interpretor()
-
-    def ascii_input():
-        description = bytes(output_queue).decode("ascii")
-        output_queue.clear()
-        command = solver.get_command(description)
-        inputs = bytes(command + "\n", "ascii")
-        interpretor.queue_inputs(inputs[1:])
-        return inputs[0]
-
-    interpretor.input_from = ascii_input
-    for code in interpretor.run(program):
-        output_queue.append(code)
-    finish_text = bytes(output_queue).decode("ascii")
-    return int(re.search(r"\d+", finish_text).group(0))
+    channel = intcode.AsciiChannel(intcode.Interpretor())
+    digest = intcode_cache.program_digest(program)
+    description = load_checkpoint(channel, solver, digest)
+    if description is None:
+        channel.interpretor.load_program(program)
+        description = channel.read()
+    saved = CHECKPOINT is None or solver.at_end
+    while not channel.halted:
+        if not saved and solver.at_checkpoint():
+            save_checkpoint(channel, solver, digest, description)
+            saved = True
+        channel.send(solver.get_command(description))
+        description = channel.read()
+    return int(re.search(r"\d+", description).group(0))
 
 
 def part2(_):
@@ -0,0 +1,342 @@
+"""Generators of valid synthetic puzzle inputs at chosen scales, for stress testing.
+
+Each generator takes a scale, whose meaning depends on the day, and a random.Random and
+returns the input text. Intcode days have no generators since their inputs are programs,
+and neither does day 12, whose part 2 cycle becomes far too long to find with more moons.
+"""
+import random
+import string
+
+PORTAL_LETTERS = string.ascii_uppercase
+
+
+def masses(scale, rng):
+    """Day 1: scale module masses."""
+    return "\n".join(str(rng.randint(50000, 150000)) for _ in range(scale))
+
+
+def wires(scale, rng):
+    """Day 3: two wires of scale segments each, which cross at least once."""
+    corner_x, corner_y = rng.randint(1, 1000), rng.randint(1, 1000)
+    # Both wires pass through (corner_x, corner_y) by going around it different ways
+    lines = [[f"R{corner_x}", f"U{corner_y}"], [f"U{corner_y}", f"R{corner_x}"]]
+    for line in lines:
+        for _ in range(scale - 2):
+            line.append(f"{rng.choice('LRUD')}{rng.randint(1, 1000)}")
+    return "\n".join(",".join(line) for line in lines)
+
+
+def password_range(scale, rng):
+    """Day 4: a range of scale numbers."""
+    start = rng.randint(100000, 500000)
+    return f"{start}-{start + scale}"
+
+
+def orbit_name(idx):
+    """Return a unique name for an object which can't be COM, YOU or SAN."""
+    digits = string.digits + string.ascii_uppercase
+    name = ""
+    while True:
+        name = digits[idx % 36] + name
+        idx //= 36
+        if not idx:
+            break
+    # Names starting with a digit can't clash with the named objects
+    return "0" + name
+
+
+def orbits(scale, rng):
+    """Day 6: an orbit tree of scale objects, deep because each object orbits one of the
+    last few objects added.
+    """
+    names = ["COM"] + [orbit_name(idx) for idx in range(scale)]
+    lines = [
+        f"{names[rng.randint(max(0, idx - 4), idx - 1)]}){names[idx]}"
+        for idx in range(1, len(names))
+    ]
+    lines.append(f"{rng.choice(names)})YOU")
+    lines.append(f"{rng.choice(names)})SAN")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def image_layers(scale, rng):
+    """Day 8: an image of scale layers, where the last has no transparent pixels."""
+    layers = [
+        "".join(rng.choice("0122") for _ in range(25 * 6)) for _ in range(scale - 1)
+    ]
+    layers.append("".join(rng.choice("01") for _ in range(25 * 6)))
+    return "".join(layers)
+
+
+def asteroid_field(scale, rng):
+    """Day 10: a square field of side scale with more than 200 asteroids."""
+    if scale * scale <= 200:
+        raise ValueError("Asteroid fields need more than 200 positions")
+    field = [[rng.random() < 0.3 for _ in range(scale)] for _ in range(scale)]
+    # Fill from the top left to make sure there are enough asteroids to destroy
+    missing = 201 - sum(map(sum, field))
+    for idx in range(scale * scale):
+        if missing <= 0:
+            break
+        if not field[idx // scale][idx % scale]:
+            field[idx // scale][idx % scale] = True
+            missing -= 1
+    return "\n".join("".join("#" if cell else "." for cell in row) for row in field)
+
+
+def chemical_name(idx):
+    """Return a unique uppercase name for a chemical which can't be ORE or FUEL."""
+    name = ""
+    while True:
+        name = string.ascii_uppercase[idx % 26] + name
+        idx //= 26
+        if not idx:
+            break
+    # Names ending in X can't clash with ORE or FUEL
+    return name + "X"
+
+
+def reactions(scale, rng):
+    """Day 14: a reaction graph of scale chemicals, each made from ore or chemicals made
+    before it, with fuel made from the last few.
+    """
+    names = ["ORE"] + [chemical_name(idx) for idx in range(scale)]
+    lines = []
+    for idx in range(1, len(names) + 1):
+        product = names[idx] if idx < len(names) else "FUEL"
+        sources = names[max(0, idx - 8) : idx]
+        reactants = rng.sample(sources, rng.randint(1, min(3, len(sources))))
+        lhs = ", ".join(f"{rng.randint(1, 9)} {reactant}" for reactant in reactants)
+        count = 1 if product == "FUEL" else rng.randint(1, 9)
+        lines.append(f"{lhs} => {count} {product}")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def signal(scale, rng):
+    """Day 16: a signal of scale digits whose message offset is in the back half of the
+    repeated signal, which is only possible below 2000 digits.
+    """
+    full_length = 10000 * scale
+    lowest, highest = full_length // 2 + 1, min(full_length - 8, 9999999)
+    if scale < 8 or lowest > highest:
+        raise ValueError("Signals need 8 to 1999 digits to have a valid message offset")
+    offset = f"{rng.randint(lowest, highest):07}"
+    return offset + "".join(rng.choice(string.digits) for _ in range(scale - 7))
+
+
+def carve_maze(cells, rng):
+    """Carve a perfect maze through a set of (x, y) cells, which should all have even or
+    all have odd coordinates. Returns the set of open positions, the cells and the walls
+    knocked through between them.
+    """
+    start = min(cells)
+    opened = {start}
+    stack = [start]
+    while stack:
+        cell_x, cell_y = stack[-1]
+        neighbours = [
+            (cell_x + step_x, cell_y + step_y)
+            for step_x, step_y in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if (cell_x + step_x, cell_y + step_y) in cells
+            and (cell_x + step_x, cell_y + step_y) not in opened
+        ]
+        if not neighbours:
+            stack.pop()
+            continue
+        next_x, next_y = rng.choice(neighbours)
+        opened.add(((cell_x + next_x) // 2, (cell_y + next_y) // 2))
+        opened.add((next_x, next_y))
+        stack.append((next_x, next_y))
+    return opened
+
+
+def key_maze(scale, rng):
+    """Day 18: a square maze of side about scale with up to 26 keys and their doors.
+
+    Each quadrant is a perfect maze, joined only through an open 3x3 square around the
+    start so the maze can be split between four robots. Doors are placed so that every
+    key behind the door for key i comes after it in a random order of the keys, meaning
+    the keys can always be collected in that order.
+    """
+    half = max(2, (scale // 2) // 2 * 2)  # even, so the center lines are walls
+    size = 2 * half + 1
+    center = (half, half)
+    cells = {(x, y) for x in range(1, size, 2) for y in range(1, size, 2)}
+    opened = set()
+    for quadrant_x in (False, True):
+        for quadrant_y in (False, True):
+            quadrant = {
+                (x, y)
+                for x, y in cells
+                if (x > half) == quadrant_x and (y > half) == quadrant_y
+            }
+            opened |= carve_maze(quadrant, rng)
+    opened |= {(half + dx, half + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+
+    # Walk the maze from the start so each position knows its parent towards it
+    parents = {center: None}
+    order = [center]
+    for pos in order:
+        for step_x, step_y in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            adj = (pos[0] + step_x, pos[1] + step_y)
+            if adj in opened and adj not in parents:
+                parents[adj] = pos
+                order.append(adj)
+
+    tiles = {}
+    start_area = {(half + dx, half + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+    key_count = min(26, max(1, size // 4), len(cells) - 4)
+    key_cells = rng.sample(sorted(cells - start_area), key_count)
+    for idx, pos in enumerate(key_cells):
+        tiles[pos] = string.ascii_lowercase[idx]
+    # first_key[pos] = smallest key index at or behind pos
+    first_key = {pos: key_count for pos in order}
+    for idx, pos in enumerate(key_cells):
+        first_key[pos] = idx
+    for pos in reversed(order[1:]):
+        parent = parents[pos]
+        first_key[parent] = min(first_key[parent], first_key[pos])
+    for idx in range(key_count):
+        candidates = [
+            pos
+            for pos in order
+            if pos not in tiles
+            and pos not in start_area
+            and idx < first_key[pos] < key_count
+        ]
+        if candidates:
+            tiles[rng.choice(candidates)] = string.ascii_uppercase[idx]
+    tiles[center] = "@"
+    return "\n".join(
+        "".join(
+            tiles.get((x, y), ".") if (x, y) in opened else "#" for x in range(size)
+        )
+        for y in range(size)
+    )
+
+
+def portal_labels(count):
+    """Return count distinct two letter portal labels other than AA and ZZ."""
+    labels = [
+        first + second
+        for first in PORTAL_LETTERS
+        for second in PORTAL_LETTERS
+        if first + second not in ("AA", "ZZ")
+    ]
+    return labels[:count]
+
+
+def donut_maze(scale, rng):
+    """Day 20: a donut shaped maze about scale wide, with portals joining its inner and
+    outer edges. The donut itself is a perfect maze, so AA and ZZ are always connected
+    without going through any portals.
+    """
+    # The maze occupies [margin, margin + region) in each axis, with the hole in the middle
+    region = max(17, scale // 2 * 2 + 1)
+    margin = 2
+    hole_start = (region // 3) // 2 * 2
+    hole_end = region - 1 - hole_start
+    size = region + 2 * margin
+
+    def in_hole(x, y):
+        return hole_start < x < hole_end and hole_start < y < hole_end
+
+    cells = {
+        (x, y)
+        for x in range(1, region, 2)
+        for y in range(1, region, 2)
+        if not in_hole(x, y)
+    }
+    opened = carve_maze(cells, rng)
+
+    # Openings are wall positions next to a cell, away from corners so labels can't overlap
+    # outer_openings[pos] = direction from the opening towards its label
+    outer_openings = {}
+    for along in range(3, region - 3, 2):
+        outer_openings[along, 0] = (0, -1)
+        outer_openings[along, region - 1] = (0, 1)
+        outer_openings[0, along] = (-1, 0)
+        outer_openings[region - 1, along] = (1, 0)
+    inner_openings = {}
+    for along in range(hole_start + 3, hole_end - 2, 2):
+        inner_openings[along, hole_start] = (0, 1)
+        inner_openings[along, hole_end] = (0, -1)
+        inner_openings[hole_start, along] = (1, 0)
+        inner_openings[hole_end, along] = (-1, 0)
+    pairs = min(len(outer_openings) - 2, len(inner_openings), scale // 4)
+    outer = rng.sample(sorted(outer_openings), pairs + 2)
+    inner = rng.sample(sorted(inner_openings), pairs)
+    labels = portal_labels(pairs)
+
+    grid = [[" "] * size for _ in range(size)]
+    for x in range(region):
+        for y in range(region):
+            if not in_hole(x, y):
+                grid[y + margin][x + margin] = "." if (x, y) in opened else "#"
+
+    def place(opening, direction, label):
+        x, y = opening
+        grid[y + margin][x + margin] = "."
+        first = (x + direction[0], y + direction[1])
+        second = (x + 2 * direction[0], y + 2 * direction[1])
+        # Labels read left to right or top to bottom whichever side they are on
+        if -1 in direction:
+            first, second = second, first
+        grid[first[1] + margin][first[0] + margin] = label[0]
+        grid[second[1] + margin][second[0] + margin] = label[1]
+
+    for opening, label in zip(outer, ["AA", "ZZ"] + labels):
+        place(opening, outer_openings[opening], label)
+    for opening, label in zip(inner, labels):
+        place(opening, inner_openings[opening], label)
+    return "\n".join("".join(row) for row in grid)
+
+
+def shuffle_techniques(scale, rng):
+    """Day 22: a shuffle of scale techniques."""
+    lines = []
+    for _ in range(scale):
+        technique = rng.randrange(3)
+        if technique == 0:
+            lines.append("deal into new stack")
+        elif technique == 1:
+            lines.append(f"cut {rng.randint(-10006, 10006)}")
+        else:
+            lines.append(f"deal with increment {rng.randint(2, 10006)}")
+    return "\n".join(lines)
+
+
+def bugs(_, rng):
+    """Day 24: a random 5x5 grid of bugs, the only size the puzzle works with."""
+    return "\n".join(
+        "".join(
+            "#" if (x, y) != (2, 2) and rng.random() < 0.4 else "." for x in range(5)
+        )
+        for y in range(5)
+    )
+
+
+# GENERATORS[day number] = function of (scale, rng) returning a puzzle input
+GENERATORS = {
+    1: masses,
+    3: wires,
+    4: password_range,
+    6: orbits,
+    8: image_layers,
+    10: asteroid_field,
+    14: reactions,
+    16: signal,
+    18: key_maze,
+    20: donut_maze,
+    22: shuffle_techniques,
+    24: bugs,
+}
+
+
+def generate(day_num, scale, seed=0):
+    """Generate a puzzle input for a day at a scale, the same every time for a seed."""
+    if day_num not in GENERATORS:
+        raise ValueError(f"There is no input generator for day {day_num}")
+    return GENERATORS[day_num](scale, random.Random(f"{day_num}:{scale}:{seed}"))
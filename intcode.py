@@ -1,5 +1,8 @@
 """Module for the Intcode interpretor."""
+import array
 import collections
+import itertools
+import time
 
 OP_ADD = 1
 OP_MUL = 2
@@ -16,28 +19,205 @@ REFERENCE_MODE = 0
 IMMEDIATE_MODE = 1
 RELATIVE_MODE = 2
 
+OPCODE_NAMES = {
+    OP_ADD: "add",
+    OP_MUL: "mul",
+    OP_INPUT: "input",
+    OP_OUTPUT: "output",
+    OP_JUMP_IF_TRUE: "jump_if_true",
+    OP_JUMP_IF_FALSE: "jump_if_false",
+    OP_LESS: "less",
+    OP_EQ: "eq",
+    OP_SHIFT: "shift",
+    OP_HALT: "halt",
+}
+MODE_NAMES = {
+    REFERENCE_MODE: "reference",
+    IMMEDIATE_MODE: "immediate",
+    RELATIVE_MODE: "relative",
+}
+
+MAX_INSTRUCTION_LENGTH = 4
+
+# Reasons for execution to stop
+NEEDS_INPUT, PRODUCED_OUTPUT, HALTED, BUDGET_EXHAUSTED = range(4)
+
+PAGE_BITS = 10
+PAGE_SIZE = 1 << PAGE_BITS
+PAGE_MASK = PAGE_SIZE - 1
+_ZERO_PAGE = array.array("q", [0]) * PAGE_SIZE
+
+
+def parse(puzzle_input):
+    """Parse an intcode program from a puzzle input."""
+    return [int(number) for number in puzzle_input.split(",")]
+
+
+class Memory:
+    """Paged memory for intcode interpretors.
+
+    Pages are dense arrays of 64-bit words allocated on first write, so reading an unset
+    address never allocates. A page is converted to a list of python ints if a value
+    written to it doesn't fit in 64 bits.
+
+    Copies share their pages copy-on-write: self.pages holds every page for reading, while
+    self.owned holds only the pages this memory may write to in place. Pages which aren't
+    owned may also be read only memoryviews of 64-bit words.
+    """
+
+    def __init__(self):
+        self.pages = {}
+        self.owned = {}
+
+    def __getitem__(self, addr):
+        try:
+            return self.pages[addr >> PAGE_BITS][addr & PAGE_MASK]
+        except KeyError:
+            return 0
+
+    def __setitem__(self, addr, val):
+        try:
+            self.owned[addr >> PAGE_BITS][addr & PAGE_MASK] = val
+        except KeyError:
+            self._own_page(addr >> PAGE_BITS)
+            self[addr] = val
+        except OverflowError:
+            self._own_page(addr >> PAGE_BITS, as_list=True)[addr & PAGE_MASK] = val
+
+    def _own_page(self, page_idx, as_list=False):
+        """Make a page writable in place, allocating or copying it as needed."""
+        page = self.pages.get(page_idx, _ZERO_PAGE)
+        if as_list or isinstance(page, list):
+            page = list(page)
+        elif isinstance(page, array.array):
+            page = page[:]
+        else:
+            # Read only views, e.g. of a memory mapped checkpoint
+            page = array.array("q", page.tobytes())
+        self.pages[page_idx] = self.owned[page_idx] = page
+        return page
+
+    def copy(self):
+        """Return a copy of the memory. Pages become shared and are copied on the next write."""
+        other = Memory()
+        other.pages = dict(self.pages)
+        self.owned.clear()
+        return other
+
+    def clear(self):
+        """Release all pages."""
+        self.pages.clear()
+        self.owned.clear()
+
+    def load(self, values, start=0):
+        """Bulk copy a sequence of values into memory starting at a given address."""
+        values = list(values)
+        idx = 0
+        while idx < len(values):
+            addr = start + idx
+            offset = addr & PAGE_MASK
+            count = min(PAGE_SIZE - offset, len(values) - idx)
+            page_idx = addr >> PAGE_BITS
+            page = self.owned.get(page_idx)
+            if page is None:
+                page = self._own_page(page_idx)
+            chunk = values[idx : idx + count]
+            try:
+                page[offset : offset + count] = array.array("q", chunk)
+            except OverflowError:
+                page = self._own_page(page_idx, as_list=True)
+                page[offset : offset + count] = chunk
+            idx += count
+
+
+Snapshot = collections.namedtuple(
+    "Snapshot", "memory relative_base instr_idx input_queue output_group"
+)
+
+
+class Profile:
+    """Instruction level statistics collected by an interpretor with profiling on."""
+
+    def __init__(self):
+        self.instructions = 0
+        self.opcodes = collections.Counter()
+        self.modes = collections.Counter()
+        self.hot_pcs = collections.Counter()
+        self.jump_targets = collections.Counter()  # only jumps which were taken
+        self.run_time = 0.0  # seconds spent executing instructions
+        self.input_wait = 0.0  # seconds spent blocked on input
+
+    @property
+    def instructions_per_second(self):
+        """The rate instructions were executed at, not counting time waiting for input."""
+        return self.instructions / self.run_time if self.run_time > 0 else 0.0
+
+    def as_dict(self):
+        """Return the statistics as a JSON serializable dict."""
+        return {
+            "instructions": self.instructions,
+            "run_time": self.run_time,
+            "input_wait": self.input_wait,
+            "instructions_per_second": self.instructions_per_second,
+            "opcodes": {
+                OPCODE_NAMES[operation]: count
+                for operation, count in self.opcodes.most_common()
+            },
+            "modes": {
+                MODE_NAMES[mode]: count for mode, count in self.modes.most_common()
+            },
+            "hot_pcs": self.hot_pcs.most_common(),
+            "jump_targets": self.jump_targets.most_common(),
+        }
+
+    def dump(self, file):
+        """Write the statistics as JSON to a file object."""
+        import json  # pylint: disable=import-outside-toplevel
+
+        json.dump(self.as_dict(), file, indent=2)
+
 
 class Interpretor:
     """Class for intcode interpretors."""
 
-    def __init__(self, input_from=None):
-        self.memory = collections.defaultdict(int)
+    def __init__(self, input_from=None, profile=False):
+        self.profile = Profile() if profile else None
+        self.trace = None  # e.g. an intcode_trace.TraceWriter
+        self.memory = Memory()
         self.relative_base = 0
         self.input_queue = collections.deque()
         self.input_from = input_from
         self.instr_idx = 0
+        self.output_group = []  # outputs of a group not yet yielded
+        self._decoded = {}  # self._decoded[addr] = (operation, handler, parameters)
+        self._code_words = set()  # addresses covered by a decoded instruction
 
-    def reset(self):
-        """Reset memory and state."""
-        self.memory.clear()
+    def reset(self, template=None):
+        """Reset memory and state. If a ProgramTemplate is given memory is restored to its
+        program image, ready to run() without reloading the program.
+        """
         self.relative_base = 0
         self.input_queue.clear()
         self.instr_idx = 0
+        self.output_group.clear()
+        self._decoded.clear()
+        self._code_words.clear()
+        if template is None:
+            self.memory.clear()
+        else:
+            self.memory = template.memory.copy()
+            self._decoded.update(template.decoded)
+            self._code_words.update(template.code_words)
 
     def load_program(self, program):
         """Load a program into the start of memory."""
-        for idx, val in enumerate(program):
-            self.memory[idx] = val
+        self.memory.load(program)
+        self._decoded.clear()
+        self._code_words.clear()
+
+    def poke(self, addr, value):
+        """Write a value to memory, e.g. to patch a program before running it."""
+        self._set((addr, REFERENCE_MODE), value)
 
     def queue_input(self, value):
         """Queue a value to give as input."""
@@ -47,119 +227,355 @@ class Interpretor:
         """Queue an iterable sequence of values to give as input."""
         self.input_queue.extend(iterable)
 
-    def run(self, program, group=1):
-        """Run a program, returns a generator which yields output values."""
-        output_queue = []
-        self.load_program(program)
+    def snapshot(self):
+        """Capture the current state. Memory pages are shared copy-on-write."""
+        return Snapshot(
+            memory=self.memory.copy(),
+            relative_base=self.relative_base,
+            instr_idx=self.instr_idx,
+            input_queue=tuple(self.input_queue),
+            output_group=tuple(self.output_group),
+        )
+
+    def restore(self, snapshot):
+        """Restore a state captured by snapshot, which can be restored again later."""
+        self.memory = snapshot.memory.copy()
+        self.relative_base = snapshot.relative_base
+        self.instr_idx = snapshot.instr_idx
+        self.input_queue = collections.deque(snapshot.input_queue)
+        self.output_group = list(snapshot.output_group)
+        self._decoded.clear()
+        self._code_words.clear()
+
+    def fork(self):
+        """Create a new interpretor continuing from the current state.
+        Memory pages are shared copy-on-write so this is cheap, continue it with run().
+        """
+        forked = type(self)(self.input_from, profile=self.profile is not None)
+        forked.memory = self.memory.copy()
+        forked.relative_base = self.relative_base
+        forked.instr_idx = self.instr_idx
+        forked.input_queue.extend(self.input_queue)
+        forked.output_group.extend(self.output_group)
+        forked._decoded.update(self._decoded)
+        forked._code_words.update(self._code_words)
+        return forked
+
+    def run(self, program=None, group=1):
+        """Run a program, returns a generator which yields output values.
+        If no program is given execution continues from the current state, e.g. after a fork.
+        """
+        if program is not None:
+            self.load_program(program)
+            self.output_group.clear()
         while True:
-            instr = self.memory[self.instr_idx]
-            operation = instr % 100
-            parameter_modes = instr // 100
-            if operation == OP_ADD:
-                self._add(parameter_modes)
-            elif operation == OP_MUL:
-                self._mul(parameter_modes)
-            elif operation == OP_INPUT:
-                self._load_input(parameter_modes)
-            elif operation == OP_OUTPUT:
-                yield from self._get_output(parameter_modes, output_queue, group)
-            elif operation == OP_JUMP_IF_TRUE:
-                self._jump_if_true(parameter_modes)
-            elif operation == OP_JUMP_IF_FALSE:
-                self._jump_if_false(parameter_modes)
-            elif operation == OP_LESS:
-                self._less(parameter_modes)
-            elif operation == OP_EQ:
-                self._eq(parameter_modes)
-            elif operation == OP_SHIFT:
-                self._shift(parameter_modes)
-            elif operation == OP_HALT:
+            status, output = self._execute(group)
+            if status == PRODUCED_OUTPUT:
+                yield output
+            elif status == NEEDS_INPUT:
+                self._receive_input()
+            else:
+                break
+
+    def resume(self, max_steps=None, group=1):
+        """Run from the current state until an output group is complete, input is needed while
+        the queue is empty, the program halts, or max_steps instructions have been executed.
+        Returns a tuple (status, output) where output is None unless the status is
+        PRODUCED_OUTPUT. Never calls input_from, queue input and resume again instead.
+        """
+        return self._execute(group, max_steps)
+
+    def run_into(self, sink, program=None, max_steps=None):
+        """Run until input is needed while the queue is empty or the program halts, appending
+        every output value to a sink such as a bytearray, array or list. Returns the status
+        as for resume, and like resume never calls input_from. If the sink rejects a value,
+        e.g. a bytearray given one outside 0 to 255, the error is raised with the output
+        instruction not yet executed, so nothing is lost.
+        """
+        if program is not None:
+            self.load_program(program)
+            self.output_group.clear()
+        if self.trace is not None:
+            sink = self.trace.tee(sink)
+        status, _ = self._execute(1, max_steps, sink)
+        return status
+
+    async def run_async(self, input_source, program=None, group=1):
+        """Async version of run, returns an async generator which yields output values.
+        Whenever input is needed and none is queued it is awaited from input_source, which is
+        either an asyncio.Queue or a function returning an awaitable, e.g. a coroutine function.
+        """
+        if program is not None:
+            self.load_program(program)
+            self.output_group.clear()
+        get_input = input_source.get if hasattr(input_source, "get") else input_source
+        while True:
+            status, output = self._execute(group)
+            if status == PRODUCED_OUTPUT:
+                yield output
+            elif status == NEEDS_INPUT:
+                start = time.perf_counter()
+                self.input_queue.appendleft(await get_input())
+                if self.profile is not None:
+                    self.profile.input_wait += time.perf_counter() - start
+            else:
                 break
+
+    def _receive_input(self):
+        """Get a value from input_from to go before anything it queues."""
+        if self.profile is None:
+            self.input_queue.appendleft(self.input_from())
+        else:
+            start = time.perf_counter()
+            self.input_queue.appendleft(self.input_from())
+            self.profile.input_wait += time.perf_counter() - start
+
+    def _execute(self, group, max_steps=None, sink=None):
+        """Execute instructions until an output group is complete, input is needed while the
+        queue is empty, the program halts, or max_steps instructions have been executed.
+        Returns a tuple (status, output). If a sink is given output values are appended to it
+        instead of stopping execution.
+        """
+        if self.profile is not None:
+            return self._execute_profiled(group, max_steps, sink)
+        decoded = self._decoded
+        for _ in itertools.repeat(None) if max_steps is None else range(max_steps):
+            try:
+                operation, handler, parameters = decoded[self.instr_idx]
+            except KeyError:
+                operation, handler, parameters = self._decode(self.instr_idx)
+            if operation == OP_OUTPUT:
+                if sink is not None:
+                    sink.append(self._get(parameters[0]))
+                    self.instr_idx += 2
+                    continue
+                output = self._output(parameters, group)
+                if output is not None:
+                    return PRODUCED_OUTPUT, output
+            elif operation == OP_INPUT and not self.input_queue:
+                return NEEDS_INPUT, None
+            elif operation == OP_HALT:
+                return HALTED, None
             else:
-                raise ValueError(f"Unknown opcode {operation}")
+                handler(self, parameters)
+        return BUDGET_EXHAUSTED, None
+
+    def _execute_profiled(self, group, max_steps, sink):
+        """The _execute loop, recording statistics into self.profile."""
+        profile = self.profile
+        decoded = self._decoded
+        start = time.perf_counter()
+        try:
+            for _ in itertools.repeat(None) if max_steps is None else range(max_steps):
+                instr_idx = self.instr_idx
+                try:
+                    operation, handler, parameters = decoded[instr_idx]
+                except KeyError:
+                    operation, handler, parameters = self._decode(instr_idx)
+                if operation == OP_INPUT and not self.input_queue:
+                    return NEEDS_INPUT, None
+                if operation == OP_HALT:
+                    return HALTED, None
+                profile.instructions += 1
+                profile.opcodes[operation] += 1
+                profile.hot_pcs[instr_idx] += 1
+                for _, mode in parameters:
+                    profile.modes[mode] += 1
+                if operation == OP_OUTPUT:
+                    if sink is not None:
+                        sink.append(self._get(parameters[0]))
+                        self.instr_idx += 2
+                        continue
+                    output = self._output(parameters, group)
+                    if output is not None:
+                        return PRODUCED_OUTPUT, output
+                else:
+                    handler(self, parameters)
+                    if instr_idx + len(parameters) + 1 != self.instr_idx:
+                        profile.jump_targets[self.instr_idx] += 1
+            return BUDGET_EXHAUSTED, None
+        finally:
+            profile.run_time += time.perf_counter() - start
+
+    def _decode(self, addr):
+        """Decode the instruction at an address into its handler and (value, mode) parameters,
+        caching the result until something writes over it.
+        """
+        instr = self.memory[addr]
+        operation = instr % 100
+        try:
+            handler, parameter_count = self._OPERATIONS[operation]
+        except KeyError:
+            raise ValueError(f"Unknown opcode {operation}") from None
+        parameter_modes = instr // 100
+        parameters = []
+        for offset in range(1, parameter_count + 1):
+            mode = parameter_modes % 10
+            if mode not in (REFERENCE_MODE, IMMEDIATE_MODE, RELATIVE_MODE):
+                raise ValueError(f"Unknown parameter mode {mode}")
+            parameters.append((self.memory[addr + offset], mode))
+            parameter_modes //= 10
+        result = self._decoded[addr] = operation, handler, tuple(parameters)
+        self._code_words.update(range(addr, addr + parameter_count + 1))
+        return result
+
+    def _invalidate(self, addr):
+        """Drop any decoded instructions covering an address."""
+        self._code_words.discard(addr)
+        for start in range(addr - MAX_INSTRUCTION_LENGTH + 1, addr + 1):
+            self._decoded.pop(start, None)
 
     def _set(self, loc, val):
         idx, mode = loc
-        if mode == REFERENCE_MODE:
-            self.memory[idx] = val
+        if mode == RELATIVE_MODE:
+            idx += self.relative_base
         elif mode == IMMEDIATE_MODE:
             raise ValueError("Cannot write in immediate mode")
-        elif mode == RELATIVE_MODE:
-            self.memory[self.relative_base + idx] = val
-        else:
-            raise ValueError(f"Unknown parameter mode {mode}")
+        # Index the pages directly, the Memory methods are only for the slow paths
+        try:
+            self.memory.owned[idx >> PAGE_BITS][idx & PAGE_MASK] = val
+        except (KeyError, OverflowError):
+            self.memory[idx] = val
+        if idx in self._code_words:
+            self._invalidate(idx)
 
     def _get(self, loc):
         idx, mode = loc
-        if mode == REFERENCE_MODE:
-            return self.memory[idx]
         if mode == IMMEDIATE_MODE:
             return idx
         if mode == RELATIVE_MODE:
-            return self.memory[self.relative_base + idx]
-        raise ValueError(f"Unknown parameter mode {mode}")
+            idx += self.relative_base
+        try:
+            return self.memory.pages[idx >> PAGE_BITS][idx & PAGE_MASK]
+        except KeyError:
+            return 0
 
-    def _add(self, parameter_modes):
-        in1 = self.memory[self.instr_idx + 1], parameter_modes % 10
-        in2 = self.memory[self.instr_idx + 2], parameter_modes // 10 % 10
-        out = self.memory[self.instr_idx + 3], parameter_modes // 100 % 10
+    def _add(self, parameters):
+        in1, in2, out = parameters
         self.instr_idx += 4
         self._set(out, self._get(in1) + self._get(in2))
 
-    def _mul(self, parameter_modes):
-        in1 = self.memory[self.instr_idx + 1], parameter_modes % 10
-        in2 = self.memory[self.instr_idx + 2], parameter_modes // 10 % 10
-        out = self.memory[self.instr_idx + 3], parameter_modes // 100 % 10
+    def _mul(self, parameters):
+        in1, in2, out = parameters
         self.instr_idx += 4
         self._set(out, self._get(in1) * self._get(in2))
 
-    def _load_input(self, parameter_modes):
-        out = self.memory[self.instr_idx + 1], parameter_modes % 10
+    def _load_input(self, parameters):
+        (out,) = parameters
         self.instr_idx += 2
-        val = self.input_queue.popleft() if self.input_queue else self.input_from()
-        self._set(out, val)
+        value = self.input_queue.popleft()
+        if self.trace is not None:
+            self.trace.record_input(value)
+        self._set(out, value)
 
-    def _get_output(self, parameter_modes, output_queue, group):
-        out = self.memory[self.instr_idx + 1], parameter_modes % 10
+    def _output(self, parameters, group):
+        """Output a value, returning the completed output group or None."""
+        (out,) = parameters
         self.instr_idx += 2
         output = self._get(out)
+        if self.trace is not None:
+            self.trace.record_output(output)
         if group == 1:
-            yield output
-        else:
-            output_queue.append(output)
-            if len(output_queue) == group:
-                yield tuple(output_queue)
-                output_queue.clear()
-
-    def _jump_if_true(self, parameter_modes):
-        cond = self.memory[self.instr_idx + 1], parameter_modes % 10
-        targ = self.memory[self.instr_idx + 2], parameter_modes // 10 % 10
+            return output
+        self.output_group.append(output)
+        if len(self.output_group) < group:
+            return None
+        output_group = tuple(self.output_group)
+        self.output_group.clear()
+        return output_group
+
+    def _jump_if_true(self, parameters):
+        cond, targ = parameters
         self.instr_idx += 3
         if self._get(cond) != 0:
             self.instr_idx = self._get(targ)
 
-    def _jump_if_false(self, parameter_modes):
-        cond = self.memory[self.instr_idx + 1], parameter_modes % 10
-        targ = self.memory[self.instr_idx + 2], parameter_modes // 10 % 10
+    def _jump_if_false(self, parameters):
+        cond, targ = parameters
         self.instr_idx += 3
         if self._get(cond) == 0:
             self.instr_idx = self._get(targ)
 
-    def _less(self, parameter_modes):
-        in1 = self.memory[self.instr_idx + 1], parameter_modes % 10
-        in2 = self.memory[self.instr_idx + 2], parameter_modes // 10 % 10
-        out = self.memory[self.instr_idx + 3], parameter_modes // 100 % 10
+    def _less(self, parameters):
+        in1, in2, out = parameters
         self.instr_idx += 4
         self._set(out, int(self._get(in1) < self._get(in2)))
 
-    def _eq(self, parameter_modes):
-        in1 = self.memory[self.instr_idx + 1], parameter_modes % 10
-        in2 = self.memory[self.instr_idx + 2], parameter_modes // 10 % 10
-        out = self.memory[self.instr_idx + 3], parameter_modes // 100 % 10
+    def _eq(self, parameters):
+        in1, in2, out = parameters
         self.instr_idx += 4
         self._set(out, int(self._get(in1) == self._get(in2)))
 
-    def _shift(self, parameter_modes):
-        offset = self.memory[self.instr_idx + 1], parameter_modes % 10
+    def _shift(self, parameters):
+        (offset,) = parameters
         self.instr_idx += 2
         self.relative_base += self._get(offset)
+
+    # _OPERATIONS[operation] = (handler, parameter count)
+    _OPERATIONS = {
+        OP_ADD: (_add, 3),
+        OP_MUL: (_mul, 3),
+        OP_INPUT: (_load_input, 1),
+        OP_OUTPUT: (_output, 1),
+        OP_JUMP_IF_TRUE: (_jump_if_true, 2),
+        OP_JUMP_IF_FALSE: (_jump_if_false, 2),
+        OP_LESS: (_less, 3),
+        OP_EQ: (_eq, 3),
+        OP_SHIFT: (_shift, 1),
+        OP_HALT: (None, 0),
+    }
+
+
+class ProgramTemplate:
+    """Class for a program image which is loaded and decoded once, so that interpretors can be
+    reset to it with a copy-on-write memory copy instead of reloading the program.
+    """
+
+    def __init__(self, program):
+        self.program = tuple(program)
+        if not all(isinstance(val, int) for val in self.program):
+            raise TypeError("Intcode programs must be sequences of integers")
+        image = Interpretor()
+        image.load_program(self.program)
+        # Decode the program as a linear sweep, skipping anything that isn't an instruction
+        addr = 0
+        while addr < len(self.program):
+            try:
+                _, _, parameters = image._decode(addr)
+                addr += len(parameters) + 1
+            except ValueError:
+                addr += 1
+        self.memory = image.memory
+        self.decoded = image._decoded
+        self.code_words = image._code_words
+
+
+class AsciiChannel:
+    """Class for talking to an intcode program over ASCII with whole strings.
+    Output values outside the ASCII range are collected in self.values.
+    """
+
+    def __init__(self, interpretor, program=None):
+        self.interpretor = interpretor
+        if program is not None:
+            interpretor.load_program(program)
+        self.values = []
+        self.halted = False
+
+    def send(self, *commands):
+        """Queue commands as input, each terminated by a newline."""
+        for command in commands:
+            self.interpretor.queue_inputs(bytes(command + "\n", "ascii"))
+
+    def read(self):
+        """Run until the program needs input or halts, returning the text it output."""
+        output = []
+        self.halted = self.interpretor.run_into(output) == HALTED
+        if output and not 0 <= min(output) <= max(output) < 128:
+            self.values.extend(value for value in output if not 0 <= value < 128)
+            output = [value for value in output if 0 <= value < 128]
+        return bytes(output).decode("ascii")
+
+    def read_lines(self):
+        """Run until the program needs input or halts, returning the lines it output."""
+        return self.read().splitlines()
@@ -0,0 +1,217 @@
+"""Module for running many copies of one intcode program in lockstep using numpy."""
+import numpy as np
+import intcode
+
+# PARAMETER_COUNTS[operation] = number of parameters
+PARAMETER_COUNTS = {
+    intcode.OP_ADD: 3,
+    intcode.OP_MUL: 3,
+    intcode.OP_INPUT: 1,
+    intcode.OP_OUTPUT: 1,
+    intcode.OP_JUMP_IF_TRUE: 2,
+    intcode.OP_JUMP_IF_FALSE: 2,
+    intcode.OP_LESS: 3,
+    intcode.OP_EQ: 3,
+    intcode.OP_SHIFT: 1,
+    intcode.OP_HALT: 0,
+}
+
+# Products of values within this magnitude always fit in 64 bits
+SAFE_FACTOR = 1 << 31
+
+
+class BatchInterpretor:
+    """Class running copies of the same intcode program in lockstep, one lane per copy.
+
+    Each lane has its own memory row, instruction index, relative base and input queue. Every
+    step executes one instruction in each running lane; lanes are grouped by the instruction
+    word they are at so each group is decoded once and executed with array operations.
+    Values are stored as 64-bit integers. Where the other interpretors move on to python
+    ints an add or multiply overflowing them raises OverflowError instead, so a batch never
+    gives a different answer.
+    """
+
+    def __init__(self, program, lane_count):
+        self.memory = np.zeros((lane_count, len(program)), dtype=np.int64)
+        self.memory[:] = program
+        self.instr_idx = np.zeros(lane_count, dtype=np.int64)
+        self.relative_base = np.zeros(lane_count, dtype=np.int64)
+        self.halted = np.zeros(lane_count, dtype=bool)
+        self.starved = np.zeros(lane_count, dtype=bool)  # waiting for more input
+        self.inputs = np.zeros((lane_count, 0), dtype=np.int64)
+        self.input_idx = np.zeros(lane_count, dtype=np.int64)
+        self.input_count = np.zeros(lane_count, dtype=np.int64)
+        self.outputs = np.zeros((lane_count, 0), dtype=np.int64)
+        self.output_count = np.zeros(lane_count, dtype=np.int64)
+
+    @property
+    def lane_count(self):
+        """The number of lanes in the batch."""
+        return len(self.instr_idx)
+
+    def queue_inputs(self, lane_inputs):
+        """Queue a sequence of input values for each lane."""
+        lane_inputs = [list(values) for values in lane_inputs]
+        assert len(lane_inputs) == self.lane_count, "need one input sequence per lane"
+        lengths = np.array([len(values) for values in lane_inputs], dtype=np.int64)
+        self.inputs = _grow_columns(
+            self.inputs, int((self.input_count + lengths).max())
+        )
+        for lane, values in enumerate(lane_inputs):
+            start = self.input_count[lane]
+            self.inputs[lane, start : start + len(values)] = values
+        self.input_count += lengths
+        self.starved &= lengths == 0
+
+    def run(self, max_steps=None):
+        """Run until every lane has halted or is waiting for input.
+        Returns a list of the output values of each lane so far.
+        """
+        steps = 0
+        while max_steps is None or steps < max_steps:
+            active = np.flatnonzero(~self.halted & ~self.starved)
+            if not active.size:
+                break
+            self._ensure_size(self.instr_idx[active])
+            instrs = self.memory[active, self.instr_idx[active]]
+            for instr in np.unique(instrs):
+                self._execute(int(instr), active[instrs == instr])
+            steps += 1
+        return self.output_lists()
+
+    def output_lists(self):
+        """Return a list of the output values of each lane."""
+        return [
+            self.outputs[lane, :count].tolist()
+            for lane, count in enumerate(self.output_count)
+        ]
+
+    def _ensure_size(self, addrs):
+        """Grow every lane's memory to fit the given addresses."""
+        if addrs.min(initial=0) < 0:
+            raise ValueError("Negative memory address")
+        needed = int(addrs.max(initial=0)) + 1
+        if needed > self.memory.shape[1]:
+            self.memory = _grow_columns(self.memory, needed)
+
+    def _get(self, parameter, lanes):
+        raw, mode = parameter
+        if mode == intcode.IMMEDIATE_MODE:
+            return raw
+        addrs = (
+            raw if mode == intcode.REFERENCE_MODE else self.relative_base[lanes] + raw
+        )
+        self._ensure_size(addrs)
+        return self.memory[lanes, addrs]
+
+    def _set(self, parameter, lanes, values):
+        raw, mode = parameter
+        if mode == intcode.IMMEDIATE_MODE:
+            raise ValueError("Cannot write in immediate mode")
+        addrs = (
+            raw if mode == intcode.REFERENCE_MODE else self.relative_base[lanes] + raw
+        )
+        self._ensure_size(addrs)
+        self.memory[lanes, addrs] = values
+
+    def _execute(self, instr, lanes):
+        """Execute one instruction word for a group of lanes."""
+        operation = instr % 100
+        if operation not in PARAMETER_COUNTS:
+            raise ValueError(f"Unknown opcode {operation}")
+        if operation == intcode.OP_HALT:
+            self.halted[lanes] = True
+            return
+        instr_idx = self.instr_idx[lanes]
+        parameter_count = PARAMETER_COUNTS[operation]
+        self._ensure_size(instr_idx + parameter_count)
+        parameter_modes = instr // 100
+        parameters = []
+        for offset in range(1, parameter_count + 1):
+            mode = parameter_modes % 10
+            if mode not in (
+                intcode.REFERENCE_MODE,
+                intcode.IMMEDIATE_MODE,
+                intcode.RELATIVE_MODE,
+            ):
+                raise ValueError(f"Unknown parameter mode {mode}")
+            parameters.append((self.memory[lanes, instr_idx + offset], mode))
+            parameter_modes //= 10
+        next_idx = instr_idx + parameter_count + 1
+
+        if operation == intcode.OP_INPUT:
+            ready = self.input_idx[lanes] < self.input_count[lanes]
+            self.starved[lanes[~ready]] = True
+            lanes, next_idx = lanes[ready], next_idx[ready]
+            parameters = [(raw[ready], mode) for raw, mode in parameters]
+            values = self.inputs[lanes, self.input_idx[lanes]]
+            self.input_idx[lanes] += 1
+            self._set(parameters[0], lanes, values)
+        elif operation == intcode.OP_OUTPUT:
+            values = self._get(parameters[0], lanes)
+            self.outputs = _grow_columns(
+                self.outputs, int(self.output_count[lanes].max()) + 1
+            )
+            self.outputs[lanes, self.output_count[lanes]] = values
+            self.output_count[lanes] += 1
+        elif operation in (intcode.OP_JUMP_IF_TRUE, intcode.OP_JUMP_IF_FALSE):
+            jump = self._get(parameters[0], lanes) != 0
+            if operation == intcode.OP_JUMP_IF_FALSE:
+                jump = ~jump
+            raw, mode = parameters[1]
+            next_idx[jump] = self._get((raw[jump], mode), lanes[jump])
+        elif operation == intcode.OP_SHIFT:
+            self.relative_base[lanes] += self._get(parameters[0], lanes)
+        else:
+            in1 = self._get(parameters[0], lanes)
+            in2 = self._get(parameters[1], lanes)
+            if operation == intcode.OP_ADD:
+                values = _checked_add(in1, in2)
+            elif operation == intcode.OP_MUL:
+                values = _checked_mul(in1, in2)
+            elif operation == intcode.OP_LESS:
+                values = (in1 < in2).astype(np.int64)
+            else:
+                values = (in1 == in2).astype(np.int64)
+            self._set(parameters[2], lanes, values)
+        self.instr_idx[lanes] = next_idx
+
+
+def _checked_add(in1, in2):
+    """Add arrays of 64-bit values, raising OverflowError if any sum doesn't fit."""
+    values = in1 + in2
+    # Overflow wraps around to the opposite sign of both operands
+    if (((in1 ^ values) & (in2 ^ values)) < 0).any():
+        raise OverflowError("Batch add overflowed 64 bits")
+    return values
+
+
+def _checked_mul(in1, in2):
+    """Multiply arrays of 64-bit values, raising OverflowError if any product doesn't fit."""
+    values = in1 * in2
+    large = (in1 >= SAFE_FACTOR) | (in1 <= -SAFE_FACTOR)
+    large |= (in2 >= SAFE_FACTOR) | (in2 <= -SAFE_FACTOR)
+    if large.any():
+        exact = np.asarray(in1, dtype=object) * np.asarray(in2, dtype=object)
+        if (exact[large] != values[large]).any():
+            raise OverflowError("Batch multiply overflowed 64 bits")
+    return values
+
+
+def _grow_columns(array, width):
+    """Return a 2d array with at least the given number of columns, doubling to amortize."""
+    if width <= array.shape[1]:
+        return array
+    grown = np.zeros(
+        (array.shape[0], max(width, 2 * array.shape[1])), dtype=array.dtype
+    )
+    grown[:, : array.shape[1]] = array
+    return grown
+
+
+def run_batch(program, lane_inputs):
+    """Run a program once for each input sequence, returning the outputs of each run."""
+    lane_inputs = list(lane_inputs)
+    batch = BatchInterpretor(program, len(lane_inputs))
+    batch.queue_inputs(lane_inputs)
+    return batch.run()
@@ -0,0 +1,285 @@
+"""Benchmark suite for intcode interpretors, with comparison against a stored baseline.
+
+Day workloads read their program from <inputs>/dayNN.txt and are skipped if it is missing.
+Run with -h for usage.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import intcode
+
+INTERPRETORS = {
+    "plain": intcode.Interpretor,
+}
+
+OPCODE_ITERATIONS = 200
+OPCODE_COPIES = 100  # copies of the opcode per iteration of the loop measuring it
+
+
+class Factory:
+    """Callable creating interpretors for a workload, keeping track of them when profiling."""
+
+    def __init__(self, interpretor_type, profile=False):
+        self.interpretor_type = interpretor_type
+        self.profile = profile
+        self.created = []
+
+    def __call__(self, input_from=None):
+        interpretor = self.interpretor_type(input_from, profile=self.profile)
+        if self.profile:
+            self.created.append(interpretor)
+        return interpretor
+
+
+def boost(make, program, mode):
+    """Run the day09 BOOST program in a mode, 1 for the self-test or 2 for the sensor."""
+    interpretor = make()
+    interpretor.queue_input(mode)
+    interpretor.run_into([], program)
+
+
+def beam_probes(make, program):
+    """Probe the day19 tractor beam over a 50x50 area from a clean state each time."""
+    template = intcode.ProgramTemplate(program)
+    interpretor = make()
+    for pos_y in range(50):
+        for pos_x in range(50):
+            interpretor.reset(template)
+            interpretor.queue_inputs((pos_x, pos_y))
+            interpretor.run_into([])
+
+
+def ship_exploration(make, program):
+    """Explore the day25 ship up to the security checkpoint."""
+    import day25  # pylint: disable=import-outside-toplevel
+
+    solver = day25.Solver()
+    channel = intcode.AsciiChannel(make(), program)
+    description = channel.read()
+    while not channel.halted and not solver.at_checkpoint():
+        channel.send(solver.get_command(description))
+        description = channel.read()
+
+
+# mem[100] counts down from 300000 to 0
+TIGHT_LOOP = [1001, 100, -1, 100, 1005, 100, 0, 99] + [0] * 92 + [300000]
+
+# Writes mem[200] to a new page 2000 times, moving the relative base by 1031 each time
+MEMORY_HEAVY = (
+    [109, 1031, 21001, 200, 0, 0, 1001, 200, -1, 200, 1005, 200, 0, 99]
+    + [0] * 186
+    + [2000]
+)
+
+
+def tight_loop(make):
+    """Run a countdown loop of add and jump instructions."""
+    make().run_into([], TIGHT_LOOP)
+
+
+def memory_heavy(make):
+    """Run a loop writing to a different memory page every iteration."""
+    make().run_into([], MEMORY_HEAVY)
+
+
+# WORKLOADS[name] = (function, day of the input it takes or None, extra arguments)
+WORKLOADS = {
+    "boost_self_test": (boost, 9, (1,)),
+    "boost_sensor": (boost, 9, (2,)),
+    "beam_probes": (beam_probes, 19, ()),
+    "ship_exploration": (ship_exploration, 25, ()),
+    "tight_loop": (tight_loop, None, ()),
+    "memory_heavy": (memory_heavy, None, ()),
+}
+
+
+def best_time(function, repeat):
+    """Return the fastest of several timed calls of a function, in seconds."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure(function, interpretor_type, repeat):
+    """Measure a workload function of an interpretor factory.
+    Timing, instruction counting and memory tracing are separate runs so they don't skew
+    each other.
+    """
+    seconds = best_time(lambda: function(Factory(interpretor_type)), repeat)
+    counting = Factory(interpretor_type, profile=True)
+    function(counting)
+    instructions = sum(made.profile.instructions for made in counting.created)
+    opcodes = {}
+    for made in counting.created:
+        for name, count in made.profile.as_dict()["opcodes"].items():
+            opcodes[name] = opcodes.get(name, 0) + count
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function(Factory(interpretor_type))
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": seconds,
+        "instructions": instructions,
+        "instructions_per_second": instructions / seconds,
+        "peak_bytes": peak_bytes,
+        "opcodes": opcodes,
+    }
+
+
+def opcode_program(instruction):
+    """Return a program looping over copies of an instruction, which is a function of its
+    own address returning its words. Addresses 901 to 905 are free for it to use.
+    """
+    program = []
+    for _ in range(OPCODE_COPIES if instruction is not None else 0):
+        program.extend(instruction(len(program)))
+    program += [1001, 900, -1, 900, 1005, 900, 0, 99]
+    assert len(program) < 900, "opcode loop overlaps its data"
+    program += [0] * (900 - len(program))
+    return program + [OPCODE_ITERATIONS, 3, 4, 0, 0]
+
+
+# OPCODE_INSTRUCTIONS[name] = function of an address returning an instruction's words
+OPCODE_INSTRUCTIONS = {
+    "add": lambda _: [1, 901, 902, 903],
+    "mul": lambda _: [2, 901, 902, 903],
+    "less": lambda _: [7, 901, 902, 903],
+    "eq": lambda _: [8, 901, 902, 903],
+    "jump_if_true": lambda addr: [1105, 1, addr + 3],
+    "jump_if_false": lambda addr: [1106, 0, addr + 3],
+    "shift": lambda _: [109, 0],
+    "input": lambda _: [3, 904],
+    "output": lambda _: [4, 901],
+}
+
+
+def opcode_costs(interpretor_type, repeat):
+    """Estimate the time each opcode takes in nanoseconds, from loops over copies of it less
+    the time of the bare loop.
+    """
+    executed = OPCODE_ITERATIONS * OPCODE_COPIES
+
+    def run_loop(program):
+        interpretor = interpretor_type()
+        interpretor.queue_inputs(range(executed))
+        interpretor.run_into([], program)
+
+    empty = opcode_program(None)
+    overhead = best_time(lambda: run_loop(empty), repeat)
+    costs = {}
+    for name, instruction in OPCODE_INSTRUCTIONS.items():
+        program = opcode_program(instruction)
+        seconds = best_time(lambda program=program: run_loop(program), repeat)
+        costs[name] = max(0.0, seconds - overhead) / executed * 1e9
+    return costs
+
+
+def run_suite(interpretor_type, names, inputs_dir, repeat):
+    """Run the named workloads, returning the results as a JSON serializable dict."""
+    results = {
+        "interpretor": interpretor_type.__name__,
+        "python": platform.python_version(),
+        "workloads": {},
+        "opcode_ns": opcode_costs(interpretor_type, repeat),
+    }
+    for name in names:
+        function, day, arguments = WORKLOADS[name]
+        if day is not None:
+            path = os.path.join(inputs_dir, f"day{day:02}.txt")
+            if not os.path.exists(path):
+                print(f"skipping {name}: no input at {path}")
+                continue
+            with open(path) as input_file:
+                arguments = (intcode.parse(input_file.read()),) + arguments
+
+        def workload(make, function=function, arguments=arguments):
+            function(make, *arguments)
+
+        results["workloads"][name] = measure(workload, interpretor_type, repeat)
+    return results
+
+
+def print_results(results):
+    """Print a table of workload results and opcode costs."""
+    print(f"{results['interpretor']} on python {results['python']}")
+    print(
+        f"{'workload':<18}{'seconds':>10}{'instructions':>14}{'MIPS':>8}{'peak MiB':>10}"
+    )
+    for name, result in results["workloads"].items():
+        print(
+            f"{name:<18}{result['seconds']:>10.4f}{result['instructions']:>14}"
+            f"{result['instructions_per_second'] / 1e6:>8.3f}"
+            f"{result['peak_bytes'] / (1 << 20):>10.2f}"
+        )
+    print(
+        "opcode costs (ns): "
+        + ", ".join(f"{name} {cost:.0f}" for name, cost in results["opcode_ns"].items())
+    )
+
+
+def compare(results, baseline, tolerance):
+    """Print the change in throughput of each workload against a baseline.
+    Returns the names of workloads which got slower by more than the tolerance.
+    """
+    regressions = []
+    for name, result in results["workloads"].items():
+        if name not in baseline["workloads"]:
+            continue
+        before = baseline["workloads"][name]["instructions_per_second"]
+        change = result["instructions_per_second"] / before - 1
+        flag = ""
+        if change < -tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<18}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    """Main entry point; runs the benchmarks based on command line input."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workloads", nargs="*", default=list(WORKLOADS))
+    parser.add_argument("--interpretor", choices=INTERPRETORS, default="plain")
+    parser.add_argument("--inputs", default="inputs", help="puzzle input directory")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--baseline", help="JSON results file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="fractional slowdown counted as a regression",
+    )
+    args = parser.parse_args()
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+    results = run_suite(
+        INTERPRETORS[args.interpretor], args.workloads, args.inputs, args.repeat
+    )
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Module for memoizing runs of intcode programs from a clean state on a finite input."""
+import collections
+import hashlib
+import os
+import pickle
+import intcode
+
+RunResult = collections.namedtuple("RunResult", "outputs peeked")
+
+
+def program_digest(program):
+    """Return a hex digest identifying a program image."""
+    return hashlib.sha256(",".join(map(str, program)).encode("ascii")).hexdigest()
+
+
+def _no_more_input():
+    raise ValueError("Memoized program ran out of input")
+
+
+class RunCache:
+    """An LRU cache of run results, optionally backed by an sqlite database on disk."""
+
+    def __init__(self, maxsize=1 << 16, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._database = None
+
+    def _db(self):
+        if self._database is None:
+            # Only loaded when results are kept on disk
+            import sqlite3  # pylint: disable=import-outside-toplevel
+
+            self._database = sqlite3.connect(self.path)
+            self._database.execute("PRAGMA synchronous = OFF")
+            self._database.execute(
+                "CREATE TABLE IF NOT EXISTS runs (key TEXT PRIMARY KEY, result BLOB)"
+            )
+        return self._database
+
+    def get(self, key):
+        """Return the cached result for a key, or None."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if self.path is not None:
+            row = (
+                self._db()
+                .execute("SELECT result FROM runs WHERE key = ?", (key,))
+                .fetchone()
+            )
+            if row is not None:
+                self.hits += 1
+                result = RunResult(*pickle.loads(row[0]))
+                self._remember(key, result)
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        """Cache a result for a key."""
+        self._remember(key, result)
+        if self.path is not None:
+            with self._db():
+                self._db().execute(
+                    "INSERT OR REPLACE INTO runs VALUES (?, ?)",
+                    (key, pickle.dumps(tuple(result))),
+                )
+
+    def _remember(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Clear the in-memory entries, leaving any database alone."""
+        self.entries.clear()
+
+
+# Set INTCODE_CACHE to a file path to keep results between processes
+CACHE = RunCache(path=os.environ.get("INTCODE_CACHE"))
+
+
+class PureProgram:
+    """Class for a program whose runs only depend on their input, so can be memoized.
+    The program is only decoded once a run misses the cache.
+    """
+
+    def __init__(self, program, cache=CACHE):
+        self.program = tuple(program)
+        self.digest = program_digest(program)
+        self.cache = cache
+        self._template = None
+        self._interpretor = None
+
+    def run(self, inputs=(), peek=(), patch=None):
+        """Run the program from a clean state on a finite input until it halts, after
+        writing the patch dict of addresses to values over the program image.
+        Returns a RunResult of the output values and the final values at the peeked addresses.
+        """
+        inputs, peek = tuple(inputs), tuple(peek)
+        patch = tuple(sorted(patch.items())) if patch else ()
+        key = f"{self.digest}:{patch}:{inputs}:{peek}"
+        result = self.cache.get(key)
+        if result is None:
+            if self._template is None:
+                self._template = intcode.ProgramTemplate(self.program)
+                self._interpretor = intcode.Interpretor(input_from=_no_more_input)
+            interpretor = self._interpretor
+            interpretor.reset(self._template)
+            for addr, value in patch:
+                interpretor.poke(addr, value)
+            interpretor.queue_inputs(inputs)
+            outputs = tuple(interpretor.run())
+            peeked = tuple(interpretor.memory[addr] for addr in peek)
+            result = RunResult(outputs, peeked)
+            self.cache.put(key, result)
+        return result
@@ -0,0 +1,86 @@
+"""Module for saving the state of a paused intcode interpretor to disk and loading it later.
+
+A checkpoint file is a magic number, the length of a JSON header and the header itself,
+padded to a multiple of 8 bytes, followed by the raw 64-bit words of each memory page in
+native byte order. Pages are memory mapped on load, so only the pages a resumed program
+actually touches are read, and only the ones it writes to are copied.
+"""
+import collections
+import json
+import mmap
+import os
+import sys
+import intcode
+
+MAGIC = b"ICCK0001"
+PAGE_BYTES = 8 * intcode.PAGE_SIZE
+
+Checkpoint = collections.namedtuple("Checkpoint", "snapshot metadata")
+
+
+def save(interpretor, path, metadata=None):
+    """Save the state of an interpretor to a file, along with any JSON serializable
+    metadata, e.g. the state of whatever is driving the program. The file is replaced
+    in one step so an interrupted save never leaves a partial checkpoint behind.
+    """
+    memory = interpretor.memory
+    array_pages = sorted(
+        idx for idx, page in memory.pages.items() if not isinstance(page, list)
+    )
+    header = {
+        "byteorder": sys.byteorder,
+        "relative_base": interpretor.relative_base,
+        "instr_idx": interpretor.instr_idx,
+        "input_queue": list(interpretor.input_queue),
+        "output_group": list(interpretor.output_group),
+        "array_pages": array_pages,
+        # Pages with values too big for 64 bits
+        "list_pages": [
+            [idx, page] for idx, page in memory.pages.items() if isinstance(page, list)
+        ],
+        "metadata": metadata,
+    }
+    encoded = json.dumps(header).encode("utf-8")
+    encoded += b" " * (-len(encoded) % 8)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(encoded).to_bytes(8, "little"))
+        file.write(encoded)
+        for idx in array_pages:
+            file.write(memory.pages[idx].tobytes())
+    os.replace(temp_path, path)
+
+
+def load(path):
+    """Load a checkpoint from a file, returning a Checkpoint of the saved metadata and a
+    Snapshot to restore an interpretor from. Raises ValueError if the file is not a
+    complete checkpoint.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if view[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not an intcode checkpoint")
+    header_start = len(MAGIC) + 8
+    header_length = int.from_bytes(view[len(MAGIC) : header_start], "little")
+    header = json.loads(bytes(view[header_start : header_start + header_length]))
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path} was saved with {header['byteorder']} endian words")
+    offset = header_start + header_length
+    if offset + len(header["array_pages"]) * PAGE_BYTES > len(view):
+        raise ValueError(f"{path} is truncated")
+    memory = intcode.Memory()
+    for idx in header["array_pages"]:
+        memory.pages[idx] = view[offset : offset + PAGE_BYTES].cast("q")
+        offset += PAGE_BYTES
+    for idx, page in header["list_pages"]:
+        memory.pages[idx] = page
+    snapshot = intcode.Snapshot(
+        memory=memory,
+        relative_base=header["relative_base"],
+        instr_idx=header["instr_idx"],
+        input_queue=tuple(header["input_queue"]),
+        output_group=tuple(header["output_group"]),
+    )
+    return Checkpoint(snapshot, header["metadata"])
@@ -0,0 +1,83 @@
+"""Module for running independent intcode jobs on one program across a pool of processes."""
+import array
+import functools
+import multiprocessing
+from multiprocessing import shared_memory
+import intcode
+
+_TEMPLATE = None  # the ProgramTemplate of the fleet's program in each worker
+
+
+def _attach(name, word_count):
+    """Worker initializer loading the program image from shared memory."""
+    global _TEMPLATE  # pylint: disable=global-statement
+    shared = shared_memory.SharedMemory(name=name)
+    words = shared.buf[: 8 * word_count].cast("q")
+    program = words.tolist()
+    words.release()
+    shared.close()
+    _TEMPLATE = intcode.ProgramTemplate(program)
+
+
+def _call(function, argument):
+    return argument, function(_TEMPLATE, argument)
+
+
+def run_on_inputs(template, inputs):
+    """Run a ProgramTemplate from a clean state on a finite input until it halts,
+    returning a tuple of the output values.
+    """
+    interpretor = intcode.Interpretor()
+    interpretor.reset(template)
+    interpretor.queue_inputs(inputs)
+    outputs = []
+    if interpretor.run_into(outputs) != intcode.HALTED:
+        raise ValueError("Program ran out of input")
+    return tuple(outputs)
+
+
+class Fleet:
+    """Class for a pool of worker processes running independent jobs on one intcode program.
+    The program image is put in shared memory once and each worker loads it from there when
+    it starts, rather than the program being pickled into every job.
+    """
+
+    def __init__(self, program, processes=None):
+        image = array.array("q", program)
+        self.shared = shared_memory.SharedMemory(
+            create=True, size=max(1, len(image) * image.itemsize)
+        )
+        self.shared.buf[: len(image) * image.itemsize] = image.tobytes()
+        self.pool = multiprocessing.Pool(
+            processes, initializer=_attach, initargs=(self.shared.name, len(image))
+        )
+
+    def imap(self, function, arguments, chunksize=1):
+        """Call function(template, argument) in the workers for each argument, where the
+        template is a ProgramTemplate of the program and the function is importable at module
+        level. Returns an iterator of (argument, result) tuples in completion order.
+        """
+        return self.pool.imap_unordered(
+            functools.partial(_call, function), arguments, chunksize
+        )
+
+    def run_all(self, input_sequences, chunksize=1):
+        """Run the program from a clean state on each input sequence.
+        Returns an iterator of (inputs, outputs) tuples in completion order.
+        """
+        return self.imap(run_on_inputs, map(tuple, input_sequences), chunksize)
+
+    def close(self):
+        """Wait for the workers to finish and free the shared program image."""
+        self.pool.close()
+        self.pool.join()
+        self.shared.close()
+        self.shared.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.pool.terminate()
+        self.close()
@@ -0,0 +1,42 @@
+"""Module for specializing intcode programs to known leading inputs by running them ahead."""
+import intcode
+import intcode_cache
+
+
+class Specialization:
+    """Class for the state of a program after running it from a clean state on known leading
+    inputs until it needs more input, halts or uses up max_steps instructions.
+
+    Every branch and memory write depending only on the program and those inputs has been
+    evaluated, so interpretors started from it skip straight past setup and self-tests.
+    """
+
+    def __init__(self, program, inputs=(), max_steps=None):
+        interpretor = intcode.Interpretor()
+        interpretor.reset(intcode.ProgramTemplate(program))
+        interpretor.queue_inputs(inputs)
+        outputs = []
+        status = interpretor.run_into(outputs, max_steps=max_steps)
+        self.outputs = tuple(outputs)  # values output while specializing
+        self.halted = status == intcode.HALTED
+        self.snapshot = interpretor.snapshot()
+
+    def interpretor(self, interpretor_type=intcode.Interpretor, input_from=None):
+        """Return a new interpretor continuing from the specialized state."""
+        interpretor = interpretor_type(input_from)
+        interpretor.restore(self.snapshot)
+        return interpretor
+
+
+SPECIALIZATIONS = intcode_cache.RunCache(maxsize=256)
+
+
+def specialize(program, inputs=(), max_steps=None):
+    """Return the Specialization of a program to some leading inputs, caching the result."""
+    inputs = tuple(inputs)
+    key = f"{intcode_cache.program_digest(program)}:{inputs}:{max_steps}"
+    specialization = SPECIALIZATIONS.get(key)
+    if specialization is None:
+        specialization = Specialization(program, inputs, max_steps)
+        SPECIALIZATIONS.put(key, specialization)
+    return specialization
@@ -0,0 +1,201 @@
+"""Module for recording the input and output of intcode runs and replaying them later."""
+import collections
+import contextlib
+import intcode
+from intcode_cache import program_digest
+
+MAGIC = b"ICT1"
+INPUT_EVENT, OUTPUT_EVENT = 0, 1
+FLUSH_SIZE = 1 << 16  # bytes
+
+
+def _encode_event(buffer, kind, value):
+    """Append an event to a bytearray as a varint of the zigzagged value and the kind."""
+    word = ((value << 1 if value >= 0 else (-value << 1) - 1) << 1) | kind
+    while word >= 0x80:
+        buffer.append(word & 0x7F | 0x80)
+        word >>= 7
+    buffer.append(word)
+
+
+def _decode_events(data, start):
+    """Return a list of (kind, value) events decoded from bytes starting at an offset."""
+    events = []
+    word, shift = 0, 0
+    for byte in data[start:]:
+        word |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        kind, zigzag = word & 1, word >> 1
+        events.append((kind, zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1)))
+        word, shift = 0, 0
+    if shift:
+        raise ValueError("Trace ends partway through an event")
+    return events
+
+
+def read_trace(path):
+    """Read a trace file, returning a tuple (program digest, list of (kind, value) events)."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not an intcode trace")
+    digest_end = len(MAGIC) + 32
+    return data[len(MAGIC) : digest_end].hex(), _decode_events(data, digest_end)
+
+
+class TraceWriter:
+    """Class writing every value an interpretor takes as input or outputs to a binary file.
+    Set it as interpretor.trace and close it after the run, or use recording().
+    """
+
+    def __init__(self, path, program):
+        self.file = open(path, "wb")
+        self.buffer = bytearray(MAGIC + bytes.fromhex(program_digest(program)))
+
+    def record_input(self, value):
+        """Record a value taken as input."""
+        _encode_event(self.buffer, INPUT_EVENT, value)
+        if len(self.buffer) >= FLUSH_SIZE:
+            self.flush()
+
+    def record_output(self, value):
+        """Record an output value."""
+        _encode_event(self.buffer, OUTPUT_EVENT, value)
+        if len(self.buffer) >= FLUSH_SIZE:
+            self.flush()
+
+    def tee(self, sink):
+        """Return a sink recording output values before appending them to another sink."""
+        return _TeeSink(self, sink)
+
+    def flush(self):
+        """Write buffered events to the file."""
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        """Flush and close the file."""
+        self.flush()
+        self.file.close()
+
+
+class _TeeSink:
+    """Sink passing output values on to another sink and recording them in a trace."""
+
+    def __init__(self, trace, sink):
+        self.trace = trace
+        self.sink = sink
+
+    def append(self, value):
+        """Append a value to the sink, then record it once the sink has taken it."""
+        self.sink.append(value)
+        self.trace.record_output(value)
+
+
+@contextlib.contextmanager
+def recording(interpretor, path, program):
+    """Context manager recording the input and output of an interpretor to a trace file."""
+    trace = interpretor.trace = TraceWriter(path, program)
+    try:
+        yield trace
+    finally:
+        interpretor.trace = None
+        trace.close()
+
+
+class Replayer:
+    """Class standing in for an interpretor by replaying a trace without running the program.
+
+    Wherever the recording took input the replayer takes a value from its queue or input_from
+    in the same way, and raises ValueError if it differs from the recorded one, so consumers
+    see exactly the recorded run. Without an input_from, run() uses the recorded inputs.
+    The end of the trace is treated as the program halting.
+    """
+
+    def __init__(self, path, input_from=None):
+        self.digest, self.events = read_trace(path)
+        self.position = 0
+        self.input_queue = collections.deque()
+        self.input_from = input_from
+        self.output_group = []
+
+    def queue_input(self, value):
+        """Queue a value to give as input."""
+        self.input_queue.append(value)
+
+    def queue_inputs(self, iterable):
+        """Queue an iterable sequence of values to give as input."""
+        self.input_queue.extend(iterable)
+
+    def _start(self, program):
+        """Check a program matches the trace and rewind to the start of it."""
+        if program_digest(program) != self.digest:
+            raise ValueError("Trace was recorded from a different program")
+        self.position = 0
+        self.output_group.clear()
+
+    def run(self, program=None, group=1):
+        """Replay a run, returns a generator which yields output values like Interpretor.run.
+        If a program is given it must be the recorded one, and replay starts over.
+        """
+        if program is not None:
+            self._start(program)
+        while True:
+            status, output = self._replay(group)
+            if status == intcode.PRODUCED_OUTPUT:
+                yield output
+            elif status == intcode.NEEDS_INPUT:
+                if self.input_from is None:
+                    self.input_queue.appendleft(self.events[self.position][1])
+                else:
+                    self.input_queue.appendleft(self.input_from())
+            else:
+                break
+
+    def resume(self, max_steps=None, group=1):
+        """Replay like Interpretor.resume. No instructions are executed so max_steps is
+        accepted for compatibility and ignored.
+        """
+        # pylint: disable=unused-argument  # max_steps is only there to match Interpretor
+        return self._replay(group)
+
+    def run_into(self, sink, program=None, max_steps=None):
+        """Replay like Interpretor.run_into, appending every output value to a sink.
+        As for resume, max_steps is accepted for compatibility and ignored.
+        """
+        # pylint: disable=unused-argument  # max_steps is only there to match Interpretor
+        if program is not None:
+            self._start(program)
+        status, _ = self._replay(1, sink)
+        return status
+
+    def _replay(self, group, sink=None):
+        events = self.events
+        while self.position < len(events):
+            kind, value = events[self.position]
+            if kind == INPUT_EVENT:
+                if not self.input_queue:
+                    return intcode.NEEDS_INPUT, None
+                given = self.input_queue.popleft()
+                if given != value:
+                    raise ValueError(
+                        f"Replay diverged at event {self.position}: "
+                        f"input {given} where {value} was recorded"
+                    )
+                self.position += 1
+                continue
+            if sink is not None:
+                sink.append(value)
+                self.position += 1
+                continue
+            self.position += 1
+            if group == 1:
+                return intcode.PRODUCED_OUTPUT, value
+            self.output_group.append(value)
+            if len(self.output_group) == group:
+                output_group = tuple(self.output_group)
+                self.output_group.clear()
+                return intcode.PRODUCED_OUTPUT, output_group
+        return intcode.HALTED, None
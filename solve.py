@@ -1,8 +1,20 @@
 """Main module for running the solution for a given day."""
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import itertools
+import os
+import pickle
 import sys
+import time
 import importlib
-import requests
-from util import timer, apply_trim_args
+from util import timer, apply_trim_args, time_repeats, summarize_times, sample_stacks
+from util import sample_memory, peak_resident_memory, fit_exponent, cpu_time
+
+INPUT_DIR = "inputs"  # local copies of puzzle inputs, as dayNN.txt
+PARSED_DIR = "parsed"  # pickled parse results, as dayNN-<input and code hash>.pickle
 
 
 def day_module_name(day_num):
@@ -15,32 +27,142 @@ def has_day(day_num):
     return importlib.util.find_spec(day_module_name(day_num)) is not None
 
 
-def get_input(day_number):
-    """Get the puzzle input for the given day as a string."""
+def input_path(day_number):
+    """Get the path of the local copy of the puzzle input for a given day."""
+    return os.path.join(INPUT_DIR, f"{day_module_name(day_number)}.txt")
+
+
+def get_input(day_number, offline=False):
+    """Get the puzzle input for the given day as a string, from the local cache if it has
+    been downloaded before. When offline only the local cache is used.
+    """
+    path = input_path(day_number)
+    try:
+        with open(path, "r") as input_file:
+            return input_file.read()
+    except FileNotFoundError:
+        if offline:
+            print(f"Could not find {path} for day {day_number} and running offline")
+            sys.exit(1)
+    puzzle_input = download_input(day_number)
+    os.makedirs(INPUT_DIR, exist_ok=True)
+    with open(path, "w") as input_file:
+        input_file.write(puzzle_input)
+    return puzzle_input
+
+
+def download_input(day_number):
+    """Download the puzzle input for the given day from adventofcode.com as a string."""
+    # Only needed when downloading, so offline runs work without it installed
+    import requests  # pylint: disable=import-outside-toplevel
+
     try:
         with open(".cookie", "r") as cookie_file:
             cookie = cookie_file.read().strip()
-            return requests.get(
-                f"https://adventofcode.com/2019/day/{day_number}/input",
-                cookies={"session": cookie},
-            ).text
     except FileNotFoundError:
         print(
             "Could not find .cookie file to get input from adventofcode.com, "
             "input is user-dependent so I need your session id"
         )
         sys.exit(1)
+    response = requests.get(
+        f"https://adventofcode.com/2019/day/{day_number}/input",
+        cookies={"session": cookie},
+    )
+    if not response.ok:
+        print(f"Could not download input for day {day_number}: {response.status_code}")
+        sys.exit(1)
+    return response.text
+
+
+class InputSource:
+    """Where puzzle inputs come from: the local cache or adventofcode.com, only the local
+    cache when offline, or the generate module at some scale if one is given.
+    """
+
+    def __init__(self, offline=False, scale=None, seed=0):
+        self.offline = offline
+        self.scale = scale
+        self.seed = seed
+
+    def get(self, day_number):
+        """Get the puzzle input for the given day as a string."""
+        if self.scale is None:
+            return get_input(day_number, self.offline)
+        import generate  # pylint: disable=import-outside-toplevel
+
+        try:
+            return generate.generate(day_number, self.scale, self.seed)
+        except ValueError as error:
+            print(f"Could not generate input for day {day_number}: {error}")
+            sys.exit(1)
+
+
+def parsed_path(day_module, puzzle_input):
+    """Get the path of the cached parse of a puzzle input. It is keyed by hashes of the input
+    and of the source of the day module, the module its parse is from, and util.
+    """
+    digest = hashlib.sha256(puzzle_input.encode("utf-8"))
+    for module_name in sorted(
+        {day_module.__name__, day_module.parse.__module__, "util"}
+    ):
+        with open(sys.modules[module_name].__file__, "rb") as source_file:
+            digest.update(source_file.read())
+    return os.path.join(
+        PARSED_DIR, f"{day_module.__name__}-{digest.hexdigest()}.pickle"
+    )
+
+
+def load_parsed(path):
+    """Load a cached parse, returning a tuple (parsed input, day state) or None."""
+    try:
+        with open(path, "rb") as parsed_file:
+            return pickle.load(parsed_file)
+    except FileNotFoundError:
+        return None
+    except Exception:  # pylint: disable=broad-except
+        # e.g. a class that was pickled has since moved, so parse again
+        return None
+
+
+def save_parsed(path, parsed_input, day_state):
+    """Cache a parse if it can be pickled, replacing older ones for the same day."""
+    try:
+        data = pickle.dumps((parsed_input, day_state), protocol=5)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return
+    os.makedirs(PARSED_DIR, exist_ok=True)
+    day_prefix = os.path.basename(path).split("-")[0]
+    for old_path in glob.glob(os.path.join(PARSED_DIR, f"{day_prefix}-*.pickle")):
+        os.remove(old_path)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as parsed_file:
+        parsed_file.write(data)
+    os.replace(temp_path, path)
 
 
-def run_day(day_num):
-    """Solve and print the answers for a given day."""
+def run_day(day_num, source=InputSource(), parse_cache=True):
+    """Solve and print the answers for a given day. If parse_cache is set parse results are
+    loaded from PARSED_DIR when the input and code haven't changed since they were saved.
+    """
     print(f"Day {day_num}")
-    with timer("downloading input"):
-        puzzle_input = get_input(day_num)
+    with timer("getting input"):
+        puzzle_input = source.get(day_num)
     day_module = importlib.import_module(day_module_name(day_num))
-    day_state = {}
-    with timer("parsing input"):
-        parsed_input = apply_trim_args(day_module.parse, puzzle_input, day_state)
+    cached = None
+    if parse_cache:
+        path = parsed_path(day_module, puzzle_input)
+        with timer("loading parsed input"):
+            cached = load_parsed(path)
+    if cached is not None:
+        parsed_input, day_state = cached
+    else:
+        day_state = {}
+        with timer("parsing input"):
+            parsed_input = apply_trim_args(day_module.parse, puzzle_input, day_state)
+        if parse_cache:
+            # Save before the parts run since some change their input
+            save_parsed(path, parsed_input, day_state)
     with timer("running part 1"):
         part1 = apply_trim_args(day_module.part1, parsed_input, day_state)
     with timer("running part 2"):
@@ -51,26 +173,517 @@ def run_day(day_num):
     print()
 
 
-def main():
-    """Main entry point; runs a day based on command line input."""
-    if len(sys.argv) < 2:
-        print(f"usage: python {sys.argv[0]} [<day numbers> | all]")
+def reset_caches():
+    """Clear memoized intcode results held in memory, so that repeated runs don't just
+    measure cache hits.
+    """
+    for module_name, cache_name in (
+        ("intcode_cache", "CACHE"),
+        ("intcode_specialize", "SPECIALIZATIONS"),
+    ):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            getattr(module, cache_name).clear()
+
+
+def benchmark_day(day_num, repeat, warmup=1, source=InputSource()):
+    """Time the parse, part 1 and part 2 of a given day over repeated runs.
+    Each run gets fresh copies of its input and of the day state left by the stage before,
+    since some days change them. Returns a dict of timing statistics for each stage.
+    """
+    import copy  # pylint: disable=import-outside-toplevel
+
+    puzzle_input = source.get(day_num)
+    day_module = importlib.import_module(day_module_name(day_num))
+    results = {}
+    stage_input, day_state = puzzle_input, {}
+    for stage in ("parse", "part1", "part2"):
+        func = getattr(day_module, stage)
+
+        def setup(stage_input=stage_input, day_state=day_state):
+            reset_caches()
+            return copy.deepcopy((stage_input, day_state))
+
+        def run(arguments, func=func):
+            stage_input, day_state = arguments
+            return apply_trim_args(func, stage_input, day_state), day_state
+
+        times, (answer, day_state) = time_repeats(run, repeat, warmup, setup)
+        results[stage] = summarize_times(times)
+        if stage == "parse":
+            stage_input = answer
+        else:
+            results[stage]["answer"] = str(answer)
+    return results
+
+
+def profile_day(day_num, directory, source=InputSource()):
+    """Profile the parse, part 1 and part 2 of a given day, saving a pstats file and a file
+    of collapsed stacks for flame graphs for each to a directory. Each stage runs once with
+    fresh copies of its inputs under a stack sampler, then once under cProfile.
+    """
+    import copy  # pylint: disable=import-outside-toplevel
+    import cProfile  # pylint: disable=import-outside-toplevel
+
+    puzzle_input = source.get(day_num)
+    day_module = importlib.import_module(day_module_name(day_num))
+    os.makedirs(directory, exist_ok=True)
+    print(f"Day {day_num}")
+    stage_input, day_state = puzzle_input, {}
+    for stage in ("parse", "part1", "part2"):
+        func = getattr(day_module, stage)
+        path = os.path.join(directory, f"{day_module_name(day_num)}_{stage}")
+        reset_caches()
+        arguments = copy.deepcopy((stage_input, day_state))
+        with sample_stacks() as stacks:
+            apply_trim_args(func, *arguments)
+        with open(f"{path}.folded", "w") as folded_file:
+            for stack, count in stacks.items():
+                folded_file.write(f"{stack} {count}\n")
+        reset_caches()
+        profiler = cProfile.Profile()
+        answer = profiler.runcall(apply_trim_args, func, stage_input, day_state)
+        profiler.dump_stats(f"{path}.pstats")
+        print(f"{stage}: saved {path}.pstats and {path}.folded")
+        if stage == "parse":
+            stage_input = answer
+    print()
+
+
+def measure_memory(day_num, source=InputSource(), top=10):
+    """Measure the memory used by the parse, part 1 and part 2 of a given day. Each stage
+    runs once with fresh copies of its inputs while sampling the resident memory, then once
+    under tracemalloc, which slows it down and uses memory of its own, to find the peak
+    traced memory and the top allocators of what is left allocated at the end.
+    Returns a dict of results for each stage, with memory in bytes.
+    """
+    import copy  # pylint: disable=import-outside-toplevel
+    import tracemalloc  # pylint: disable=import-outside-toplevel
+
+    puzzle_input = source.get(day_num)
+    day_module = importlib.import_module(day_module_name(day_num))
+    results = {}
+    stage_input, day_state = puzzle_input, {}
+    for stage in ("parse", "part1", "part2"):
+        func = getattr(day_module, stage)
+        reset_caches()
+        arguments = copy.deepcopy((stage_input, day_state))
+        with sample_memory() as timeline:
+            apply_trim_args(func, *arguments)
+        del arguments
+        reset_caches()
+        tracemalloc.start()
+        try:
+            answer = apply_trim_args(func, stage_input, day_state)
+            _, traced_peak = tracemalloc.get_traced_memory()
+            allocators = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        finally:
+            tracemalloc.stop()
+        results[stage] = {
+            "peak_rss": max((rss for _, rss in timeline), default=None),
+            "process_peak_rss": peak_resident_memory(),
+            "traced_peak": traced_peak,
+            "top_allocators": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size": stat.size,
+                    "count": stat.count,
+                }
+                for stat in allocators
+            ],
+            "timeline": timeline,
+        }
+        if stage == "parse":
+            stage_input = answer
+    return results
+
+
+def measure_scaling(day_num, scales, seed=0, repeat=3):
+    """Time the parse, part 1 and part 2 of a given day on generated inputs at each scale,
+    taking the fastest of some runs, and find their peak memory in another run under
+    tracemalloc. Then fit how each grows as a power of the scale, so an exponent of 1 is
+    linear. A scale the day fails at, e.g. by recursing too deep, is recorded with its
+    error and ends the series, as is one the input can't be generated at.
+    Returns a dict of the points measured and the exponents.
+    """
+    import copy  # pylint: disable=import-outside-toplevel
+    import tracemalloc  # pylint: disable=import-outside-toplevel
+    import generate  # pylint: disable=import-outside-toplevel
+
+    day_module = importlib.import_module(day_module_name(day_num))
+    stages = ("parse", "part1", "part2")
+    points = []
+    for scale in scales:
+        point = {"scale": scale, "input_bytes": None, "stages": {}}
+        points.append(point)
+        try:
+            puzzle_input = generate.generate(day_num, scale, seed)
+            point["input_bytes"] = len(puzzle_input)
+            stage_input, day_state = puzzle_input, {}
+            for stage in stages:
+                func = getattr(day_module, stage)
+
+                def setup(stage_input=stage_input, day_state=day_state):
+                    reset_caches()
+                    return copy.deepcopy((stage_input, day_state))
+
+                def run(arguments, func=func):
+                    stage_input, day_state = arguments
+                    return apply_trim_args(func, stage_input, day_state), day_state
+
+                times, (answer, next_state) = time_repeats(run, repeat, 0, setup)
+                arguments = setup()
+                tracemalloc.start()
+                try:
+                    run(arguments)
+                    _, traced_peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                point["stages"][stage] = {
+                    "seconds": min(times) / 1e9,
+                    "traced_peak": traced_peak,
+                }
+                if stage == "parse":
+                    stage_input = answer
+                day_state = next_state
+        except Exception as error:  # pylint: disable=broad-except
+            point["error"] = f"{type(error).__name__}: {error}"
+            break
+    exponents = {}
+    for stage in stages:
+        measured = [point for point in points if stage in point["stages"]]
+        exponents[stage] = {
+            metric: fit_exponent(
+                [point["scale"] for point in measured],
+                [point["stages"][stage][metric] for point in measured],
+            )
+            for metric in ("seconds", "traced_peak")
+        }
+    return {"points": points, "exponents": exponents}
+
+
+def steep_exponents(results, max_exponent):
+    """Return a list of (stage, metric, exponent) for growth steeper than max_exponent."""
+    return [
+        (stage, metric, exponent)
+        for stage, metrics in results["exponents"].items()
+        for metric, exponent in metrics.items()
+        if exponent is not None and exponent > max_exponent
+    ]
+
+
+def print_scaling(day_num, results, max_exponent=None):
+    """Print a table of the time and memory of each stage of a day at each scale, followed
+    by the fitted exponents, marking any steeper than max_exponent.
+    """
+    stages = list(results["exponents"])
+    print(f"Day {day_num}")
+    print(
+        f"{'scale':>10}{'input KiB':>11}"
+        + "".join(f"{stage + ' ms':>12}" for stage in stages)
+        + "".join(f"{stage + ' MiB':>12}" for stage in stages)
+    )
+    for point in results["points"]:
+        input_bytes = point["input_bytes"]
+        kib = "-" if input_bytes is None else f"{input_bytes / 1024:0.1f}"
+        row = f"{point['scale']:>10}{kib:>11}"
+        for metric, unit in (("seconds", 1e-3), ("traced_peak", 1 << 20)):
+            for stage in stages:
+                stats = point["stages"].get(stage)
+                value = "-" if stats is None else f"{stats[metric] / unit:0.3f}"
+                row += f"{value:>12}"
+        print(row)
+        if "error" in point:
+            print(f"{'':>10}failed: {point['error']}")
+    row = f"{'exponent':>21}"
+    for metric in ("seconds", "traced_peak"):
+        for stage in stages:
+            exponent = results["exponents"][stage][metric]
+            row += f"{'?' if exponent is None else f'{exponent:0.2f}':>12}"
+    print(row)
+    if max_exponent is not None:
+        for stage, metric, exponent in steep_exponents(results, max_exponent):
+            print(f"{stage} {metric} grows as scale^{exponent:0.2f}  SUPERLINEAR")
+    print()
+
+
+def print_memory(day_num, results):
+    """Print a table of the memory used by each stage of a day and its top allocator."""
+    mebibyte = 1 << 20
+    print(f"Day {day_num}")
+    print(f"{'stage':<8}{'peak RSS MiB':>14}{'traced MiB':>12}  top allocator")
+    for stage, stats in results.items():
+        peak_rss = "?"
+        if stats["peak_rss"] is not None:
+            peak_rss = f"{stats['peak_rss'] / mebibyte:0.2f}"
+        allocator = ""
+        if stats["top_allocators"]:
+            top = stats["top_allocators"][0]
+            allocator = f"{top['location']} ({top['size'] / mebibyte:0.2f} MiB)"
         print(
-            "example:\n"
-            + f"$ python {sys.argv[0]} 1 # solves day 1\n"
-            + f"$ python {sys.argv[0]} 2 5 # solves days 2 and 5\n"
-            + f"$ python {sys.argv[0]} all # solves all days in the repo\n"
+            f"{stage:<8}{peak_rss:>14}{stats['traced_peak'] / mebibyte:>12.2f}"
+            f"  {allocator}"
         )
-        sys.exit(1)
+    print()
+
+
+def print_benchmark(day_num, results):
+    """Print a table of the timing statistics for a day."""
+    print(f"Day {day_num}")
+    print(f"{'stage':<8}{'min ms':>12}{'median ms':>12}{'p95 ms':>12}")
+    for stage, stats in results.items():
+        print(
+            f"{stage:<8}{stats['min'] / 1e6:>12.3f}{stats['median'] / 1e6:>12.3f}"
+            f"{stats['p95'] / 1e6:>12.3f}"
+        )
+    print()
+
+
+def write_results(path, results):
+    """Write measurement results to a file as JSON."""
+    import json  # pylint: disable=import-outside-toplevel
+
+    with open(path, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+
+
+def run_day_buffered(day_num, source=InputSource(), parse_cache=True):
+    """Run a day capturing what it prints, e.g. to run it in another process.
+    Returns a tuple (output, wall seconds, CPU seconds, exit status), where the CPU time
+    includes any processes the day started, e.g. its own multiprocessing pool.
+    """
+    output = io.StringIO()
+    start_wall, start_cpu = time.perf_counter(), cpu_time()
+    status = 0
+    with contextlib.redirect_stdout(output):
+        try:
+            run_day(day_num, source, parse_cache)
+        except SystemExit as exit_error:
+            status = exit_error.code
+    wall, cpu = time.perf_counter() - start_wall, cpu_time() - start_cpu
+    return output.getvalue(), wall, cpu, status
+
+
+def run_days_parallel(day_nums, source=InputSource(), jobs=None, parse_cache=True):
+    """Run days across a pool of worker processes, printing their output in day order."""
+    # Slow to import and only needed when running in parallel
+    import concurrent.futures  # pylint: disable=import-outside-toplevel
+
+    # Unlike multiprocessing.Pool workers these aren't daemons, so days can start their own
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        results = executor.map(
+            run_day_buffered,
+            day_nums,
+            itertools.repeat(source),
+            itertools.repeat(parse_cache),
+        )
+        for day_num, (output, wall, cpu, status) in zip(day_nums, results):
+            print(output, end="")
+            print(f"day {day_num}: {wall:0.5f} seconds wall, {cpu:0.5f} seconds CPU\n")
+            if status:
+                executor.shutdown(cancel_futures=True)
+                sys.exit(status)
+
+
+def import_profile(day_nums, limit=12):
+    """Print how long starting python and importing each day takes, broken down by module.
+    Each day is imported in a fresh interpreter so none of its imports are already loaded.
+    """
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    for day_num in day_nums:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                f"import solve, {day_module_name(day_num)}",
+            ],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print(f"Day {day_num}: import failed\n{result.stderr.splitlines()[-1]}\n")
+            continue
+        # Lines look like "import time: <self us> | <cumulative us> | <indented module>"
+        rows = []
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "self [us]" not in line:
+                self_us, cumulative_us, module = line[len("import time:") :].split("|")
+                rows.append((int(self_us), int(cumulative_us), module.strip()))
+        total = sum(self_us for self_us, _, _ in rows)
+        print(f"Day {day_num}: imports took {total / 1000:0.2f} ms")
+        print(f"{'self ms':>10}{'cumulative ms':>15}  module")
+        for self_us, cumulative_us, module in sorted(rows, reverse=True)[:limit]:
+            print(f"{self_us / 1000:>10.2f}{cumulative_us / 1000:>15.2f}  {module}")
+        print()
+
+
+def parse_args():
+    """Parse the command line arguments."""
+    program = sys.argv[0]
+    parser = argparse.ArgumentParser(
+        description="Solve advent of code 2019 days.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="example:\n"
+        + f"$ python {program} 1 # solves day 1\n"
+        + f"$ python {program} 2 5 # solves days 2 and 5\n"
+        + f"$ python {program} all # solves all days in the repo\n"
+        + f"$ python {program} --offline all # only uses inputs in {INPUT_DIR}/\n"
+        + f"$ python {program} -j 4 all # solves 4 days at a time\n"
+        + f"$ python {program} --generate 1000 --bench 5 22 # times a 1000 line day 22\n"
+        + f"$ python {program} 6 --scaling 1000 2000 4000 8000 # fits day 6's growth\n",
+    )
+    parser.add_argument("days", nargs="+", help='day numbers, or "all"')
+    parser.add_argument(
+        "--offline", action="store_true", help=f"only use inputs in {INPUT_DIR}/"
+    )
+    parser.add_argument(
+        "--generate",
+        type=int,
+        metavar="SCALE",
+        help="use synthetic inputs of this scale from generate.py instead",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="random seed for generated inputs"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of days to solve in parallel, or 0 for the number of CPUs",
+    )
+    parser.add_argument(
+        "--no-parse-cache",
+        dest="parse_cache",
+        action="store_false",
+        help=f"always parse inputs rather than loading them from {PARSED_DIR}/",
+    )
+    parser.add_argument(
+        "--bench",
+        type=int,
+        metavar="REPEAT",
+        help="time each stage over this many runs instead of once",
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=1, help="untimed runs before benchmarking"
+    )
+    parser.add_argument(
+        "--bench-output", metavar="FILE", help="file to write benchmark results to"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profiles",
+        metavar="DIR",
+        help="save profiles of each stage to a directory, profiles/ if not given",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="measure the memory used by each stage instead of solving once",
+    )
+    parser.add_argument(
+        "--memory-output", metavar="FILE", help="file to write memory results to"
+    )
+    parser.add_argument(
+        "--scaling",
+        type=int,
+        nargs="+",
+        metavar="SCALE",
+        help="fit how each stage grows over generated inputs at these scales",
+    )
+    parser.add_argument(
+        "--max-exponent",
+        type=float,
+        help="fail if a stage of --scaling grows faster than scale to this power",
+    )
+    parser.add_argument(
+        "--scaling-output", metavar="FILE", help="file to write scaling results to"
+    )
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="report how long importing each day takes instead of solving it",
+    )
+    args = parser.parse_args()
+    measuring = (
+        args.bench is not None
+        or args.profile is not None
+        or args.memory
+        or args.scaling is not None
+    )
+    if args.jobs < 0:
+        parser.error("--jobs can't be negative")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count()
+    if measuring and args.jobs > 1:
+        parser.error("measurements run one day at a time, not in parallel")
+    if args.scaling is not None and args.generate is not None:
+        parser.error("--scaling generates its own inputs at each scale")
+    if args.days == ["all"]:
+        args.days = list(itertools.takewhile(has_day, itertools.count(1)))
+    else:
+        try:
+            args.days = [int(day) for day in args.days]
+        except ValueError:
+            parser.error('days must be numbers or "all"')
+    return args
+
+
+def main():
+    """Main entry point; runs days based on command line input."""
+    args = parse_args()
+    source = InputSource(args.offline, args.generate, args.seed)
+    # Generated inputs would just push the real ones out of the parse cache
+    parse_cache = args.parse_cache and args.generate is None
+    if args.import_profile:
+        import_profile(args.days)
+        sys.exit(0)
+    if args.profile is not None:
+        for day_num in args.days:
+            profile_day(day_num, args.profile, source)
+        sys.exit(0)
+    if args.memory:
+        results = {}
+        for day_num in args.days:
+            results[day_num] = measure_memory(day_num, source)
+            print_memory(day_num, results[day_num])
+        if args.memory_output:
+            write_results(args.memory_output, results)
+        sys.exit(0)
+    if args.scaling is not None:
+        results = {"scales": args.scaling, "seed": args.seed, "days": {}}
+        steep = False
+        for day_num in args.days:
+            results["days"][day_num] = measure_scaling(day_num, args.scaling, args.seed)
+            print_scaling(day_num, results["days"][day_num], args.max_exponent)
+            if args.max_exponent is not None:
+                steep |= bool(
+                    steep_exponents(results["days"][day_num], args.max_exponent)
+                )
+        if args.scaling_output:
+            write_results(args.scaling_output, results)
+        sys.exit(1 if steep else 0)
+    if args.bench is not None:
+        results = {"repeat": args.bench, "warmup": args.warmup, "days": {}}
+        for day_num in args.days:
+            results["days"][day_num] = benchmark_day(
+                day_num, args.bench, args.warmup, source
+            )
+            print_benchmark(day_num, results["days"][day_num])
+        if args.bench_output:
+            write_results(args.bench_output, results)
+        sys.exit(0)
     with timer("overall"):
-        if sys.argv[1:] == ["all"]:
-            day_num = 1
-            while has_day(day_num):
-                run_day(day_num)
-                day_num += 1
+        if args.jobs > 1:
+            run_days_parallel(args.days, source, args.jobs, parse_cache)
         else:
-            for day_num in (int(arg) for arg in sys.argv[1:]):
-                run_day(day_num)
+            for day_num in args.days:
+                run_day(day_num, source, parse_cache)
     sys.exit(0)
 
 
@@ -3,7 +3,8 @@ import collections
 import functools
 import operator
 import math
-import inspect
+import os
+import sys
 import time
 import contextlib
 import itertools
@@ -112,15 +113,172 @@ def ilast(iterable):
 @contextlib.contextmanager
 def timer(desc):
     """Context manager for timing a block of code once and printing the time."""
-    start = time.time()
+    start = time.perf_counter()
     yield
-    end = time.time()
+    end = time.perf_counter()
     print(f"{desc}: took {end - start:0.5f} seconds")
 
 
+@contextlib.contextmanager
+def sample_stacks(interval=0.001):
+    """Context manager sampling the stack of the calling thread every interval seconds from
+    a background thread. Yields a Counter of collapsed stacks, which fills in as the block
+    runs, mapping "outer;...;inner" strings of functions to how many samples saw them.
+    """
+    import threading  # pylint: disable=import-outside-toplevel
+
+    target = threading.get_ident()
+    stacks = collections.Counter()
+    done = threading.Event()
+    current_frames = sys._current_frames  # pylint: disable=protected-access
+
+    def sample():
+        while not done.wait(interval):
+            frame = current_frames().get(target)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                filename = os.path.basename(code.co_filename)
+                names.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            # Skip a sample of the block finishing
+            if not done.is_set():
+                stacks[";".join(reversed(names))] += 1
+
+    # Let the sampler take the GIL as often as it wants to sample
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(interval)
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield stacks
+    finally:
+        done.set()
+        sampler.join()
+        sys.setswitchinterval(switch_interval)
+
+
+def cpu_time():
+    """Return the CPU seconds used by this process and the child processes it has waited
+    for, e.g. the workers of a multiprocessing.Pool once it has been closed. Only this
+    process is counted where the resource module is unavailable.
+    """
+    seconds = time.process_time()
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return seconds
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return seconds + children.ru_utime + children.ru_stime
+
+
+def resident_memory():
+    """Return the resident set size of this process in bytes, or None if it is unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, AttributeError):
+        return None
+
+
+def peak_resident_memory():
+    """Return the most resident memory this process has ever used in bytes, or None if it
+    is unknown.
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux counts in kilobytes, macOS in bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextlib.contextmanager
+def sample_memory(interval=0.01):
+    """Context manager sampling the resident memory of this process every interval seconds
+    from a background thread. Yields a list of (seconds, bytes) samples, which fills in as
+    the block runs.
+    """
+    import threading  # pylint: disable=import-outside-toplevel
+
+    samples = []
+    done = threading.Event()
+    start = time.perf_counter()
+
+    def sample():
+        while True:
+            rss = resident_memory()
+            if rss is None:
+                return
+            samples.append((time.perf_counter() - start, rss))
+            if done.wait(interval):
+                return
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield samples
+    finally:
+        done.set()
+        sampler.join()
+        rss = resident_memory()
+        if rss is not None:
+            samples.append((time.perf_counter() - start, rss))
+
+
+def time_repeats(func, repeat, warmup=1, setup=None):
+    """Time repeated calls of a function with perf_counter_ns, after some untimed warm-up
+    calls. If given, setup is called untimed before each call to return its argument.
+    Returns a tuple (list of times in nanoseconds, result of the last call).
+    """
+    result = None
+    times = []
+    for run in range(warmup + repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter_ns()
+        result = func(argument)
+        end = time.perf_counter_ns()
+        if run >= warmup:
+            times.append(end - start)
+    return times, result
+
+
+def summarize_times(times):
+    """Return a dict of the min, median, 95th percentile and mean of some times."""
+    ordered = sorted(times)
+    middle = len(ordered) // 2
+    return {
+        "repeat": len(ordered),
+        "min": ordered[0],
+        "median": (ordered[middle] + ordered[~middle]) / 2,
+        "p95": ordered[math.ceil(0.95 * len(ordered)) - 1],
+        "mean": sum(ordered) / len(ordered),
+    }
+
+
+def fit_exponent(sizes, values):
+    """Fit values = c * size ** k by least squares on a log-log scale, returning k.
+    Returns None without positive values at two or more distinct sizes.
+    """
+    points = [
+        (math.log(size), math.log(value))
+        for size, value in zip(sizes, values)
+        if size > 0 and value > 0
+    ]
+    if len({log_size for log_size, _ in points}) < 2:
+        return None
+    mean_x = sum(log_size for log_size, _ in points) / len(points)
+    mean_y = sum(log_value for _, log_value in points) / len(points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return covariance / variance
+
+
 def apply_trim_args(func, *args):
     """Apply a function to given arguments, using only as many as required."""
-    arg_count = len(inspect.signature(func).parameters)
+    # Cheaper than inspect.signature, which is slow to import
+    arg_count = func.__code__.co_argcount
     return func(*args[:arg_count])
 
 